@@ -20,11 +20,8 @@ __license__ = "Apache-2.0 OR MIT"
 from typing import Optional
 import logging
 
-# Set up default logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Logging is configured by the entry points; the library only emits records
+logger = logging.getLogger(__name__)
 
 def version() -> str:
     """Return the version string."""
@@ -32,11 +29,9 @@ def version() -> str:
 
 def internal_error(message: str, *args) -> None:
     """Log an internal error message."""
-    logger = logging.getLogger(__name__)
-    if args:
-        logger.error(f"Internal Error: {message.format(*args)}")
-    else:
-        logger.error(f"Internal Error: {message}")
+    # Skip formatting entirely when errors are filtered out
+    if logger.isEnabledFor(logging.ERROR):
+        logger.error("Internal Error: %s", message.format(*args) if args else message)
 
 # Export commonly used types and functions
 __all__ = [
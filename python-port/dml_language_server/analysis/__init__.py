@@ -8,20 +8,32 @@ This is an enhanced version porting concepts from the Rust implementation.
 SPDX-License-Identifier: Apache-2.0 and MIT
 """
 
+import hashlib
 import logging
+import multiprocessing
+import os
+import sys
 from pathlib import Path
-from typing import List, Dict, Set, Optional, Any, Union, Tuple
+from typing import List, Dict, Set, FrozenSet, Optional, Any, Union, Tuple, Sequence, Iterator
 from dataclasses import dataclass, field
 from enum import Enum
-from collections import defaultdict
+from collections import deque, OrderedDict
+from contextlib import ExitStack, contextmanager
 import threading
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+try:
+    # Cheaper uncontended acquire/release than threading.RLock
+    from fastrlock.rlock import FastRLock as RLock
+except ImportError:
+    from threading import RLock
 
 from ..config import Config
 from ..file_management import FileManager
-from ..span import ZeroSpan, ZeroPosition, ZeroRange, SpanBuilder
+from ..span import ZeroSpan, ZeroPosition, ZeroRange, SpanBuilder, SpanIndex
 from ..lsp_data import DMLDiagnostic, DMLDiagnosticSeverity, DMLLocation, DMLSymbol, DMLSymbolKind
-from .types import DMLError, DMLErrorKind, ReferenceKind, SymbolReference, NodeRef
+from .types import DATACLASS_SLOTS, DMLError, DMLErrorKind, ReferenceKind, SymbolReference, NodeRef
+from .parsing import DMLParser
 from .parsing.enhanced_parser import EnhancedDMLParser, TemplateDeclaration, DeviceDeclaration, DMLVersionDeclaration
 from .parsing.template_system import TemplateSystem
 from .parsing.syntax_validator import SyntaxValidator
@@ -29,12 +41,42 @@ from .parsing.syntax_validator import SyntaxValidator
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def compute_content_hash(content: str) -> bytes:
+    """Compute the digest used to key parsed file content."""
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+
+
+# Shared scope chains, keyed by their parent chain and innermost name. The
+# pool is emptied when it reaches its limit, so names of closed files and
+# of scopes that only existed mid-edit are not kept for the server's lifetime.
+_SCOPE_CHAIN_POOL_SIZE = 4096
+_scope_chains: Dict[Tuple[Tuple[str, ...], str], Tuple[str, ...]] = {}
+
+
+def _intern_scope_chain(parent_chain: Tuple[str, ...], name: str) -> Tuple[str, ...]:
+    """Get the shared tuple for a parent chain extended by one scope name."""
+    chain = _scope_chains.get((parent_chain, name))
+    if chain is None:
+        if len(_scope_chains) >= _SCOPE_CHAIN_POOL_SIZE:
+            _scope_chains.clear()
+        chain = _scope_chains.setdefault((parent_chain, name), parent_chain + (name,))
+    return chain
+
+
+def _reintern_scope_chain(chain: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Get the shared tuple equal to a chain built elsewhere, e.g. unpickled."""
+    interned: Tuple[str, ...] = ()
+    for name in chain:
+        interned = _intern_scope_chain(interned, name)
+    return interned
+
+
+@dataclass(**DATACLASS_SLOTS)
 class SymbolDefinition:
     """Represents a symbol definition with references."""
     symbol: DMLSymbol
     references: List[SymbolReference] = field(default_factory=list)
-    scope_chain: List[str] = field(default_factory=list)
+    scope_chain: Tuple[str, ...] = ()
     
     def add_reference(self, ref: SymbolReference):
         """Add a reference to this symbol."""
@@ -44,6 +86,12 @@ class SymbolDefinition:
 class SymbolScope:
     """Enhanced scope management for symbol resolution."""
     
+    # Child count from which position lookups use a span index
+    CHILD_INDEX_THRESHOLD = 16
+    
+    __slots__ = ('name', 'span', 'parent', 'children', 'symbols', 'references',
+                 '_scope_chain', '_child_index', '_bounds', '_all_symbols')
+    
     def __init__(self, name: str, span: ZeroSpan, parent: Optional['SymbolScope'] = None):
         self.name = name
         self.span = span
@@ -51,119 +99,216 @@ class SymbolScope:
         self.children: List['SymbolScope'] = []
         self.symbols: Dict[str, SymbolDefinition] = {}
         self.references: List[SymbolReference] = []
+        # Name and parent never change, so the chain is computed once
+        self._scope_chain: Optional[Tuple[str, ...]] = None
+        self._child_index: Optional[SpanIndex['SymbolScope']] = None
+        # Span corners as plain ints for position tests without attribute chains
+        start, end = span.range.start, span.range.end
+        self._bounds = (start.line, start.column, end.line, end.column)
+        # Symbols of this scope and its descendants, dropped by add_symbol
+        # and by attaching a child
+        self._all_symbols: Optional[List[SymbolDefinition]] = None
         
         if parent:
             parent.children.append(self)
+            parent._invalidate_all_symbols()
     
     def add_symbol(self, symbol: DMLSymbol) -> SymbolDefinition:
         """Add a symbol to this scope."""
         definition = SymbolDefinition(symbol=symbol, scope_chain=self.get_scope_chain())
-        self.symbols[symbol.name] = definition
+        self.symbols[sys.intern(symbol.name)] = definition
+        self._invalidate_all_symbols()
         return definition
     
+    def _invalidate_all_symbols(self) -> None:
+        """Drop the cached symbol lists of this scope and its ancestors."""
+        scope: Optional[SymbolScope] = self
+        while scope is not None:
+            scope._all_symbols = None
+            scope = scope.parent
+    
     def add_reference(self, ref: SymbolReference):
         """Add a reference to this scope."""
         self.references.append(ref)
     
     def resolve_symbol(self, name: str) -> Optional[SymbolDefinition]:
         """Resolve a symbol by name, searching up the scope chain."""
-        # First check current scope
-        if name in self.symbols:
-            return self.symbols[name]
-        
-        # Check parent scopes
-        if self.parent:
-            return self.parent.resolve_symbol(name)
-        
+        scope: Optional[SymbolScope] = self
+        while scope is not None:
+            definition = scope.symbols.get(name)
+            if definition is not None:
+                return definition
+            scope = scope.parent
         return None
     
-    def get_scope_chain(self) -> List[str]:
+    def get_scope_chain(self) -> Tuple[str, ...]:
         """Get the full scope chain from root to this scope."""
-        if self.parent:
-            return self.parent.get_scope_chain() + [self.name]
-        return [self.name]
+        if self._scope_chain is None:
+            # Collect the scopes whose chains are not known yet, innermost first
+            pending = []
+            scope: Optional[SymbolScope] = self
+            while scope is not None and scope._scope_chain is None:
+                pending.append(scope)
+                scope = scope.parent
+            
+            chain = scope._scope_chain if scope is not None else ()
+            for scope in reversed(pending):
+                chain = _intern_scope_chain(chain, scope.name)
+                scope._scope_chain = chain
+        return self._scope_chain
+    
+    def reintern_scope_chains(self) -> None:
+        """Share the scope chains of this scope tree with this process's pool.
+        
+        Trees parsed in worker processes arrive with chains of their own.
+        """
+        stack = [self]
+        while stack:
+            scope = stack.pop()
+            if scope._scope_chain is not None:
+                scope._scope_chain = _reintern_scope_chain(scope._scope_chain)
+            for definition in scope.symbols.values():
+                definition.scope_chain = _reintern_scope_chain(definition.scope_chain)
+            stack.extend(scope.children)
     
     def find_scope_at_position(self, pos: ZeroPosition) -> Optional['SymbolScope']:
         """Find the innermost scope containing the given position."""
-        if not self.span.range.contains_position(pos):
+        line, column = pos.line, pos.column
+        start_line, start_column, end_line, end_column = self._bounds
+        if not ((start_line < line or (start_line == line and start_column <= column)) and
+                (line < end_line or (line == end_line and column <= end_column))):
             return None
         
-        # Check children first (innermost scope)
-        for child in self.children:
-            if result := child.find_scope_at_position(pos):
-                return result
-        
-        # If no child contains the position, this scope does
-        return self
+        # Descend into the first child containing the position until none
+        # does; the scan is inlined since this runs on every hover/completion
+        threshold = self.CHILD_INDEX_THRESHOLD
+        scope = self
+        while True:
+            children = scope.children
+            if len(children) >= threshold:
+                child = scope._find_indexed_child(pos)
+            else:
+                child = None
+                for candidate in children:
+                    start_line, start_column, end_line, end_column = candidate._bounds
+                    if ((start_line < line or (start_line == line and start_column <= column)) and
+                            (line < end_line or (line == end_line and column <= end_column))):
+                        child = candidate
+                        break
+            if child is None:
+                return scope
+            scope = child
+    
+    def _find_indexed_child(self, pos: ZeroPosition) -> Optional['SymbolScope']:
+        """Find the first child scope containing the given position via a span index."""
+        children = self.children
+        # Rebuild the index whenever children were added since it was built
+        if self._child_index is None or len(self._child_index) != len(children):
+            self._child_index = SpanIndex((child.span, child) for child in children)
+        return self._child_index.find(pos)
     
     def get_all_symbols(self, include_children: bool = True) -> List[SymbolDefinition]:
         """Get all symbols in this scope and optionally its children."""
-        symbols = list(self.symbols.values())
-        
-        if include_children:
-            for child in self.children:
-                symbols.extend(child.get_all_symbols(include_children=True))
+        if not include_children:
+            return list(self.symbols.values())
         
-        return symbols
+        if self._all_symbols is None:
+            # Depth-first, parents before children, in declaration order
+            symbols: List[SymbolDefinition] = []
+            stack = [self]
+            while stack:
+                scope = stack.pop()
+                symbols.extend(scope.symbols.values())
+                stack.extend(reversed(scope.children))
+            self._all_symbols = symbols
+        return list(self._all_symbols)
 
 
 class AdvancedSymbolTable:
     """Enhanced symbol table with cross-file resolution and reference tracking."""
     
+    # Number of independent locks; writes to different keys rarely share one
+    LOCK_SHARDS = 16
+    
     def __init__(self):
         self.global_symbols: Dict[str, SymbolDefinition] = {}
         self.file_scopes: Dict[Path, SymbolScope] = {}
-        self.references: Dict[str, List[SymbolReference]] = defaultdict(list)
-        self._lock = threading.RLock()
+        self.references: Dict[str, List[SymbolReference]] = {}
+        self._locks = [RLock() for _ in range(self.LOCK_SHARDS)]
+    
+    def _lock_for(self, key: Any) -> Any:
+        """Get the lock guarding entries for a symbol name or file path."""
+        return self._locks[hash(key) % self.LOCK_SHARDS]
+    
+    @contextmanager
+    def _all_locks(self) -> Iterator[None]:
+        """Hold every shard lock, acquired in a fixed order to avoid deadlock."""
+        with ExitStack() as stack:
+            for lock in self._locks:
+                stack.enter_context(lock)
+            yield
     
     def create_file_scope(self, file_path: Path, span: ZeroSpan) -> SymbolScope:
         """Create a root scope for a file."""
-        with self._lock:
+        with self._lock_for(file_path):
             scope = SymbolScope(name=f"file:{file_path.name}", span=span)
             self.file_scopes[file_path] = scope
             return scope
     
+    def remove_file_scope(self, file_path: Path) -> None:
+        """Remove the root scope of a file."""
+        with self._lock_for(file_path):
+            self.file_scopes.pop(file_path, None)
+    
     def add_global_symbol(self, symbol: DMLSymbol) -> SymbolDefinition:
         """Add a symbol to the global scope."""
-        with self._lock:
-            definition = SymbolDefinition(symbol=symbol, scope_chain=["global"])
-            self.global_symbols[symbol.name] = definition
+        name = sys.intern(symbol.name)
+        with self._lock_for(name):
+            definition = SymbolDefinition(symbol=symbol, scope_chain=_intern_scope_chain((), "global"))
+            self.global_symbols[name] = definition
             return definition
     
     def add_reference(self, ref: SymbolReference):
         """Add a reference to the symbol table."""
-        with self._lock:
-            self.references[ref.node_ref.name].append(ref)
+        name = sys.intern(ref.node_ref.name)
+        with self._lock_for(name):
+            bucket = self.references.get(name)
+            if bucket is None:
+                self.references[name] = [ref]
+            else:
+                bucket.append(ref)
     
     def resolve_symbol(self, name: str, file_path: Optional[Path] = None, 
                       position: Optional[ZeroPosition] = None) -> Optional[SymbolDefinition]:
         """Resolve a symbol with context-aware lookup."""
-        with self._lock:
-            # If we have file and position context, start with local scope
-            if file_path and position and file_path in self.file_scopes:
-                file_scope = self.file_scopes[file_path]
-                if local_scope := file_scope.find_scope_at_position(position):
-                    if symbol := local_scope.resolve_symbol(name):
+        if file_path:
+            with self._lock_for(file_path):
+                file_scope = self.file_scopes.get(file_path)
+                if file_scope is not None:
+                    # If we have a position, start with local scope
+                    if position:
+                        if local_scope := file_scope.find_scope_at_position(position):
+                            if symbol := local_scope.resolve_symbol(name):
+                                return symbol
+                    
+                    # Check file-level scope
+                    if symbol := file_scope.resolve_symbol(name):
                         return symbol
-            
-            # Check file-level scope
-            if file_path and file_path in self.file_scopes:
-                if symbol := self.file_scopes[file_path].resolve_symbol(name):
-                    return symbol
-            
-            # Check global scope
+        
+        # Check global scope
+        with self._lock_for(name):
             return self.global_symbols.get(name)
     
     def find_references(self, symbol_name: str) -> List[SymbolReference]:
         """Find all references to a symbol."""
-        with self._lock:
+        with self._lock_for(symbol_name):
             return self.references.get(symbol_name, []).copy()
     
     def get_symbols_in_scope(self, file_path: Path, position: ZeroPosition) -> List[SymbolDefinition]:
         """Get all symbols visible from a given position."""
-        with self._lock:
-            symbols = []
-            
+        symbols = []
+        
+        with self._lock_for(file_path):
             if file_path in self.file_scopes:
                 file_scope = self.file_scopes[file_path]
                 if local_scope := file_scope.find_scope_at_position(position):
@@ -172,19 +317,35 @@ class AdvancedSymbolTable:
                     while current:
                         symbols.extend(current.symbols.values())
                         current = current.parent
-            
-            # Add global symbols
+        
+        # Add global symbols
+        with self._all_locks():
             symbols.extend(self.global_symbols.values())
-            
-            return symbols
+        
+        return symbols
 
 
 class IsolatedAnalysis:
     """Enhanced analysis of a single file with advanced scope and reference tracking."""
     
-    def __init__(self, file_path: Path, content: str):
+    # Below this many symbols a linear position lookup beats building an index
+    SYMBOL_INDEX_THRESHOLD = 32
+    
+    # Hashes of content the enhanced parser failed on, oldest first
+    ENHANCED_FAILURE_CACHE_SIZE = 256
+    _enhanced_failures: 'OrderedDict[bytes, None]' = OrderedDict()
+    # Analyses run on parse threads and timer threads at once
+    _enhanced_failures_lock = threading.Lock()
+    
+    __slots__ = ('file_path', 'content', 'content_hash', 'span_builder', 'root_scope',
+                 'errors', 'symbols', 'symbol_definitions', 'references', 'imports',
+                 'dml_version', 'dependencies', 'enhanced_parser', 'template_system',
+                 'syntax_validator', 'ast_declarations', '_symbol_index', '_qualified_names')
+    
+    def __init__(self, file_path: Path, content: str, content_hash: Optional[bytes] = None):
         self.file_path = file_path
         self.content = content
+        self.content_hash = content_hash
         self.span_builder = SpanBuilder(str(file_path))
         self.span_builder.set_content(content)
         
@@ -213,62 +374,24 @@ class IsolatedAnalysis:
         self.syntax_validator = SyntaxValidator()
         self.ast_declarations: List = []
         
+        # Position lookup index, built on first use
+        self._symbol_index: Optional[SpanIndex[DMLSymbol]] = None
+        
+        # Resolved qualified names; symbols never change after parsing
+        self._qualified_names: Dict[str, Optional[SymbolDefinition]] = {}
+        
         # Parse the file
         self._parse()
     
     def _parse(self) -> None:
         """Parse the DML file using enhanced parser and template system."""
         try:
-            # Try enhanced parser first
-            try:
-                self.enhanced_parser = EnhancedDMLParser(self.content, str(self.file_path))
-                self.ast_declarations = self.enhanced_parser.parse()
-                
-                # Extract basic information
-                self.errors = self.enhanced_parser.get_errors()
-                self.symbols = self.enhanced_parser.get_symbols()
-                self.references = self.enhanced_parser.get_references()
-                self.imports = self.enhanced_parser.imports
-                self.dml_version = self.enhanced_parser.dml_version
-                
-                # Initialize template system with global scope
-                self.template_system.initialize_template_scope(self.root_scope)
-                
-                # Validate file structure (DML language rules)
-                self._validate_file_structure()
-                
-                # Process AST declarations
-                self._process_ast_declarations()
-                
-                logger.debug(f"Enhanced parser processed {len(self.symbols)} symbols, {len(self.errors)} errors")
-                
-            except Exception as enhanced_error:
-                logger.warning(f"Enhanced parser failed for {self.file_path}: {enhanced_error}, falling back to basic parser")
-                
-                # Fallback to basic parser
-                from .parsing import DMLParser
-                parser = DMLParser(self.content, str(self.file_path))
-                
-                # Parse and extract information
-                self.dml_version = parser.extract_dml_version()
-                self.imports = parser.extract_imports()
-                self.symbols = parser.extract_symbols()
-                self.errors = parser.get_errors()
+            # Try enhanced parser first, unless it already failed on this content
+            if self._is_known_enhanced_failure() or not self._parse_enhanced():
+                self._parse_basic()
             
             # Build symbol table
-            for symbol in self.symbols:
-                if symbol.name in self.symbol_definitions:
-                    # Duplicate symbol
-                    error = DMLError(
-                        kind=DMLErrorKind.DUPLICATE_SYMBOL,
-                        message=f"Duplicate symbol '{symbol.name}'",
-                        span=symbol.location.span
-                    )
-                    self.errors.append(error)
-                else:
-                    self.symbol_definitions[symbol.name] = SymbolDefinition(symbol=symbol)
-                    # Also add to scope
-                    self.root_scope.add_symbol(symbol)
+            self._build_symbol_definitions()
             
             # Run syntax validation
             file_span = ZeroSpan(str(self.file_path), ZeroRange(ZeroPosition(0, 0), ZeroPosition(0, 0)))
@@ -279,7 +402,7 @@ class IsolatedAnalysis:
             )
             self.errors.extend(validation_errors)
             
-            logger.debug(f"Validation found {len(validation_errors)} additional errors/warnings")
+            logger.debug("Validation found %d additional errors/warnings", len(validation_errors))
                     
         except Exception as e:
             logger.error(f"Failed to parse {self.file_path}: {e}")
@@ -291,6 +414,86 @@ class IsolatedAnalysis:
             )
             self.errors.append(error)
     
+    def _parse_enhanced(self) -> bool:
+        """Parse with the enhanced parser, returning False if it failed."""
+        try:
+            self.enhanced_parser = EnhancedDMLParser(self.content, str(self.file_path))
+            self.ast_declarations = self.enhanced_parser.parse()
+            
+            # Extract basic information
+            self.errors = self.enhanced_parser.get_errors()
+            self.symbols = self.enhanced_parser.get_symbols()
+            self.references = self.enhanced_parser.get_references()
+            self.imports = [sys.intern(name) for name in self.enhanced_parser.imports]
+            self.dml_version = self.enhanced_parser.dml_version
+            
+            # Initialize template system with global scope
+            self.template_system.initialize_template_scope(self.root_scope)
+            
+            # Validate file structure (DML language rules)
+            self._validate_file_structure()
+            
+            # Process AST declarations
+            self._process_ast_declarations()
+            
+            logger.debug("Enhanced parser processed %d symbols, %d errors", len(self.symbols), len(self.errors))
+            return True
+            
+        except Exception as enhanced_error:
+            logger.warning("Enhanced parser failed for %s: %s, falling back to basic parser",
+                           self.file_path, enhanced_error)
+            self._remember_enhanced_failure()
+            return False
+    
+    def _parse_basic(self) -> None:
+        """Parse with the basic parser."""
+        parser = DMLParser(self.content, str(self.file_path))
+        
+        # Parse and extract information
+        self.dml_version = parser.extract_dml_version()
+        self.imports = [sys.intern(name) for name in parser.extract_imports()]
+        self.symbols = parser.extract_symbols()
+        self.errors = parser.get_errors()
+    
+    def _is_known_enhanced_failure(self) -> bool:
+        """Check whether the enhanced parser already failed on this content."""
+        if self.content_hash is None:
+            return False
+        with self._enhanced_failures_lock:
+            return self.content_hash in self._enhanced_failures
+    
+    def _remember_enhanced_failure(self) -> None:
+        """Record that the enhanced parser cannot handle this content."""
+        if self.content_hash is None:
+            return
+        with self._enhanced_failures_lock:
+            failures = self._enhanced_failures
+            failures[self.content_hash] = None
+            if len(failures) > self.ENHANCED_FAILURE_CACHE_SIZE:
+                failures.popitem(last=False)
+    
+    def _build_symbol_definitions(self) -> None:
+        """Register parsed symbols by name, reporting duplicates."""
+        # Bind the containers once; this loop runs for every symbol in the file
+        definitions = self.symbol_definitions
+        errors = self.errors
+        add_to_scope = self.root_scope.add_symbol
+        
+        for symbol in self.symbols:
+            # Intern so every analysis shares one string per identifier
+            name = symbol.name = sys.intern(symbol.name)
+            if name in definitions:
+                # Duplicate symbol
+                errors.append(DMLError(
+                    kind=DMLErrorKind.DUPLICATE_SYMBOL,
+                    message=f"Duplicate symbol '{name}'",
+                    span=symbol.location.span
+                ))
+            else:
+                definitions[name] = SymbolDefinition(symbol=symbol)
+                # Also add to scope
+                add_to_scope(symbol)
+    
     def _validate_file_structure(self) -> None:
         """Validate DML file structure according to language rules."""
         if not self.ast_declarations:
@@ -331,18 +534,21 @@ class IsolatedAnalysis:
     
     def _process_ast_declarations(self) -> None:
         """Process AST declarations for template resolution and symbol extraction."""
-        templates_to_process = []
         devices_to_process = []
         
-        # First pass: collect templates and devices
+        # Register templates and collect devices; devices are processed once
+        # all templates are known, since a device may precede its templates.
+        # Exact type checks: most declarations are neither, and neither class
+        # has subclasses.
+        add_template = self.template_system.add_template
         for declaration in self.ast_declarations:
-            if isinstance(declaration, TemplateDeclaration):
-                templates_to_process.append(declaration)
-                self.template_system.add_template(declaration)
-            elif isinstance(declaration, DeviceDeclaration):
+            declaration_type = type(declaration)
+            if declaration_type is TemplateDeclaration:
+                add_template(declaration)
+            elif declaration_type is DeviceDeclaration:
                 devices_to_process.append(declaration)
         
-        # Second pass: process devices with template application
+        # Process devices with template application
         for device in devices_to_process:
             if device.templates:
                 logger.debug(f"Applying templates {device.templates} to device {device.name}")
@@ -368,6 +574,11 @@ class IsolatedAnalysis:
     
     def get_symbol_at_position(self, position: ZeroPosition) -> Optional[DMLSymbol]:
         """Get the symbol at the given position."""
+        if len(self.symbols) >= self.SYMBOL_INDEX_THRESHOLD:
+            if self._symbol_index is None:
+                self._symbol_index = self._build_symbol_index()
+            return self._symbol_index.find(position)
+        
         # First check in scope hierarchy
         scope = self.root_scope.find_scope_at_position(position)
         if scope:
@@ -382,11 +593,26 @@ class IsolatedAnalysis:
                 return symbol
         return None
     
+    def _build_symbol_index(self) -> SpanIndex[DMLSymbol]:
+        """Index symbol spans in the order get_symbol_at_position scans them."""
+        ordered = [definition.symbol for definition in self.root_scope.symbols.values()]
+        ordered.extend(self.symbols)
+        
+        seen = set()
+        entries = []
+        for symbol in ordered:
+            if id(symbol) not in seen:
+                seen.add(id(symbol))
+                entries.append((symbol.location.span, symbol))
+        return SpanIndex(entries)
+    
     def find_symbol(self, name: str) -> Optional[SymbolDefinition]:
         """Find a symbol by name (simple name or qualified name)."""
         # Handle qualified names (e.g., "device.bank.register")
         if '.' in name:
-            return self._resolve_qualified_name(name)
+            if name not in self._qualified_names:
+                self._qualified_names[name] = self._resolve_qualified_name(name)
+            return self._qualified_names[name]
         
         return self.symbol_definitions.get(name)
     
@@ -462,9 +688,34 @@ class IsolatedAnalysis:
         return [error.to_diagnostic() for error in self.errors]
 
 
+def _gil_enabled() -> bool:
+    """Check whether the GIL is active; False only on free-threaded builds running without it."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is None or is_gil_enabled()
+
+
+def _parse_isolated(item: Tuple[Path, str, bytes]) -> IsolatedAnalysis:
+    """Parse one file in isolation; entry point for parser worker processes."""
+    file_path, content, content_hash = item
+    analysis = IsolatedAnalysis(file_path, content, content_hash)
+    # The parser and its token stream are not read after parsing, and
+    # would make up most of the result pickled back from a worker
+    analysis.enhanced_parser = None
+    return analysis
+
+
 class DeviceAnalysis:
     """Enhanced analysis engine for DML device files with advanced symbol resolution."""
     
+    # Maximum number of parsed files kept in the content-hash cache
+    PARSE_CACHE_SIZE = 512
+    
+    # Delay before a scheduled analysis runs, so bursts of edits coalesce
+    ANALYSIS_DEBOUNCE_SECONDS = 0.020
+    
+    # Minimum number of files to parse before handing them to worker processes
+    PARALLEL_PARSE_THRESHOLD = 8
+    
     def __init__(self, config: Config, file_manager: FileManager):
         self.config = config
         self.file_manager = file_manager
@@ -472,42 +723,81 @@ class DeviceAnalysis:
         
         # Enhanced symbol management
         self.symbol_table = AdvancedSymbolTable()
-        self.reference_tracker: Dict[str, List[SymbolReference]] = defaultdict(list)
-        self.dependency_graph: Dict[Path, Set[Path]] = defaultdict(set)
+        self.reference_tracker: Dict[str, List[SymbolReference]] = {}
+        self.dependency_graph: Dict[Path, Set[Path]] = {}
         
         # Legacy compatibility
         self.global_symbol_table: Dict[str, List[SymbolDefinition]] = {}
         
+        # Analysis each file had when it was last merged into the global table
+        self._merged_analyses: Dict[Path, IsolatedAnalysis] = {}
+        
+        # Parsed files keyed by (path, content hash), least recently used first
+        self._parse_cache: "OrderedDict[Tuple[Path, bytes], IsolatedAnalysis]" = OrderedDict()
+        
         # Thread pool for parallel analysis
         self._executor = ThreadPoolExecutor(max_workers=4)
-        self._analysis_lock = threading.RLock()
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._parse_threads: Optional[ThreadPoolExecutor] = None
+        self._analysis_lock = RLock()
         self.dependency_order: List[Path] = []
+        
+        # Debounced analyses waiting to run, by file
+        self._pending: Dict[Path, Tuple[threading.Timer, Future]] = {}
+        # Guards _pending only, so scheduling never waits on a running analysis
+        self._pending_lock = threading.Lock()
+        
+        # Resolved form of each path seen by the public API
+        self._resolved_paths: Dict[Path, Path] = {}
+        
+        # Directory listings used to resolve imports
+        self._dir_cache: Dict[Path, FrozenSet[str]] = {}
+        
+        # Include paths per file, valid for one configuration revision
+        self._include_cache: Dict[Path, Tuple[Path, ...]] = {}
+        self._include_cache_revision = config.revision
+        
+        # Outcome of each (importing file, import name) lookup; valid as long
+        # as the include paths and directory listings it was based on
+        self._import_cache: Dict[Tuple[Path, str], bool] = {}
     
-    def analyze_file(self, file_path: Path, content: str) -> List[DMLError]:
+    def _resolve(self, file_path: Path) -> Path:
+        """Resolve a path, reusing earlier results to avoid repeated syscalls."""
+        resolved = self._resolved_paths.get(file_path)
+        if resolved is None:
+            resolved = file_path.resolve()
+            self._resolved_paths[file_path] = resolved
+        return resolved
+    
+    def analyze_file(self, file_path: Path, content: str,
+                     content_hash: Optional[bytes] = None) -> List[DMLError]:
         """
         Analyze a single file and its dependencies.
         
         Args:
             file_path: Path to the file to analyze
             content: Content of the file
+            content_hash: Precomputed compute_content_hash(content), if known
             
         Returns:
             List of errors found
         """
-        file_path = file_path.resolve()
-        
         try:
-            # Create isolated analysis
-            analysis = IsolatedAnalysis(file_path, content)
-            self.file_analyses[file_path] = analysis
-            
-            # Analyze dependencies
-            self._analyze_dependencies(file_path)
-            
-            # Perform cross-file analysis
-            self._analyze_cross_file_references(file_path)
-            
-            return analysis.errors
+            with self._analysis_lock:
+                file_path = self._resolve(file_path)
+                
+                # Create isolated analysis (reused if the content is unchanged)
+                analysis = self._get_isolated_analysis(file_path, content, content_hash)
+                self._set_file_analysis(file_path, analysis)
+                
+                # Analyze dependencies
+                self._analyze_dependencies(file_path)
+                
+                # Perform cross-file analysis
+                self._analyze_cross_file_references(file_path)
+                
+                # Return a copy so callers can extend it without touching the cached analysis
+                return list(analysis.errors)
             
         except Exception as e:
             logger.error(f"Failed to analyze {file_path}: {e}")
@@ -520,24 +810,228 @@ class DeviceAnalysis:
     
     def _analyze_dependencies(self, file_path: Path) -> None:
         """Analyze dependencies of a file."""
-        dependencies = self.file_manager.get_dependencies(file_path)
+        # Walk the dependency graph with a worklist, collecting every file that
+        # still needs analysis before touching the disk
+        dep_paths: List[Path] = []
+        seen = {file_path}
+        queue = deque([file_path])
+        while queue:
+            for dep_path in self.file_manager.get_dependencies(queue.popleft()):
+                if dep_path in seen or dep_path in self.file_analyses:
+                    continue
+                seen.add(dep_path)
+                dep_paths.append(dep_path)
+                queue.append(dep_path)
+        
+        if not dep_paths:
+            return
         
-        for dep_path in dependencies:
-            if dep_path not in self.file_analyses:
+        # Read and hash dependencies concurrently and parse each one as soon as
+        # its content arrives, so only in-flight buffers are ever held in memory
+        parse_pool = None
+        if len(dep_paths) >= self.PARALLEL_PARSE_THRESHOLD:
+            parse_pool = self._get_parse_pool()
+        
+        analyses: Dict[Path, IsolatedAnalysis] = {}
+        parses: Dict[Future, Tuple[Path, bytes, str]] = {}
+        reads = {self._executor.submit(self._read_dependency, dep_path): dep_path for dep_path in dep_paths}
+        for read in as_completed(reads):
+            dep_path = reads.pop(read)
+            loaded = read.result()
+            if loaded is None:
+                continue
+            
+            dep_content, content_hash = loaded
+            dep_analysis = self._lookup_parse_cache(dep_path, content_hash)
+            if dep_analysis is None and parse_pool is not None:
                 try:
-                    # Read dependency content
-                    with open(dep_path, 'r', encoding='utf-8') as f:
-                        dep_content = f.read()
-                    
-                    # Analyze dependency
-                    dep_analysis = IsolatedAnalysis(dep_path, dep_content)
-                    self.file_analyses[dep_path] = dep_analysis
-                    
-                    # Recursively analyze its dependencies
-                    self._analyze_dependencies(dep_path)
-                    
+                    parse = parse_pool.submit(_parse_isolated, (dep_path, dep_content, content_hash))
+                    parses[parse] = (dep_path, content_hash, dep_content)
+                    continue
                 except Exception as e:
-                    logger.error(f"Failed to analyze dependency {dep_path}: {e}")
+                    logger.warning(f"Parallel parsing failed, falling back to serial parsing: {e}")
+                    parse_pool = None
+            if dep_analysis is None:
+                dep_analysis = self._parse_dependency(dep_path, dep_content, content_hash)
+            if dep_analysis is not None:
+                analyses[dep_path] = dep_analysis
+        
+        for parse in as_completed(parses):
+            dep_path, content_hash, dep_content = parses.pop(parse)
+            try:
+                dep_analysis = parse.result()
+                dep_analysis.root_scope.reintern_scope_chains()
+                self._store_parse_cache(dep_path, content_hash, dep_analysis)
+            except Exception as e:
+                logger.warning(f"Parallel parsing of {dep_path} failed, parsing serially: {e}")
+                dep_analysis = self._parse_dependency(dep_path, dep_content, content_hash)
+            if dep_analysis is not None:
+                analyses[dep_path] = dep_analysis
+        
+        for dep_path in dep_paths:
+            if dep_path in analyses:
+                self._set_file_analysis(dep_path, analyses[dep_path])
+    
+    def _get_parse_pool(self) -> Optional[Executor]:
+        """Get the executor used to parse dependencies in parallel."""
+        # Without a GIL, threads parse in parallel and skip pickling the results
+        if not _gil_enabled():
+            if self._parse_threads is None:
+                self._parse_threads = ThreadPoolExecutor(max_workers=os.cpu_count())
+            return self._parse_threads
+        return self._get_process_pool()
+    
+    def _get_process_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Get the parser worker pool, creating it on first use."""
+        if self._process_pool is None:
+            try:
+                self._process_pool = ProcessPoolExecutor(
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            except Exception as e:
+                logger.warning(f"Cannot start parser worker processes: {e}")
+        return self._process_pool
+    
+    def shutdown(self) -> None:
+        """Cancel pending analyses and stop the worker pools."""
+        with self._pending_lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        with self._analysis_lock:
+            pools = [self._executor, self._process_pool, self._parse_threads]
+            self._process_pool = None
+            self._parse_threads = None
+        
+        for timer, future in pending:
+            timer.cancel()
+            future.cancel()
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=True)
+    
+    def _parse_dependency(self, dep_path: Path, dep_content: str,
+                          content_hash: bytes) -> Optional[IsolatedAnalysis]:
+        """Parse a dependency in this process and cache the result."""
+        try:
+            dep_analysis = _parse_isolated((dep_path, dep_content, content_hash))
+        except Exception as e:
+            logger.error(f"Failed to analyze dependency {dep_path}: {e}")
+            return None
+        self._store_parse_cache(dep_path, content_hash, dep_analysis)
+        return dep_analysis
+    
+    def _read_dependency(self, dep_path: Path) -> Optional[Tuple[str, bytes]]:
+        """Read dependency content and its hash, or None if it cannot be read."""
+        try:
+            # Files whose mtime is unchanged are not read again
+            content = self.file_manager.read_cached(dep_path)
+            # Hashing runs on the worker too; hashlib releases the GIL for large inputs
+            return content, compute_content_hash(content)
+        except Exception as e:
+            logger.error(f"Failed to analyze dependency {dep_path}: {e}")
+            return None
+    
+    def schedule_analysis(self, file_path: Path, content: str) -> Future:
+        """
+        Schedule a debounced analysis of a file.
+        
+        Calls for the same file within ANALYSIS_DEBOUNCE_SECONDS of each other
+        collapse into a single analysis of the latest content.
+        
+        Args:
+            file_path: Path to the file to analyze
+            content: Content of the file
+            
+        Returns:
+            Future resolving to the errors found, shared by all coalesced calls
+        """
+        file_path = self._resolve(file_path)
+        
+        with self._pending_lock:
+            future: Optional[Future] = None
+            pending = self._pending.get(file_path)
+            if pending:
+                timer, future = pending
+                timer.cancel()
+            if future is None:
+                future = Future()
+            
+            timer = threading.Timer(self.ANALYSIS_DEBOUNCE_SECONDS,
+                                    self._run_scheduled_analysis,
+                                    args=(file_path, content))
+            timer.daemon = True
+            self._pending[file_path] = (timer, future)
+            timer.start()
+            return future
+    
+    def analyze_file_now(self, file_path: Path) -> Optional[List[DMLError]]:
+        """
+        Run a pending scheduled analysis immediately.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            List of errors found, or None if no analysis was pending
+        """
+        file_path = self._resolve(file_path)
+        
+        with self._pending_lock:
+            pending = self._pending.get(file_path)
+            if not pending:
+                return None
+            timer, _ = pending
+            timer.cancel()
+            content = timer.args[1]
+        return self._run_scheduled_analysis(file_path, content)
+    
+    def _run_scheduled_analysis(self, file_path: Path, content: str) -> Optional[List[DMLError]]:
+        """Run a scheduled analysis and resolve its future."""
+        # Wait for a running analysis first, so a reschedule made meanwhile
+        # is picked up here and analyses of one file finish in edit order
+        with self._analysis_lock:
+            with self._pending_lock:
+                pending = self._pending.get(file_path)
+                # A newer call may have rescheduled this file, or it was flushed already
+                if not pending or pending[0].args[1] is not content:
+                    return None
+                del self._pending[file_path]
+            future = pending[1]
+            
+            try:
+                errors = self.analyze_file(file_path, content)
+            except Exception as e:
+                # The future reports the failure to whoever scheduled it
+                future.set_exception(e)
+                return None
+            future.set_result(errors)
+            return errors
+    
+    def _get_isolated_analysis(self, file_path: Path, content: str,
+                               content_hash: Optional[bytes] = None) -> IsolatedAnalysis:
+        """Get the analysis for file content, parsing only on a cache miss."""
+        if content_hash is None:
+            content_hash = compute_content_hash(content)
+        
+        analysis = self._lookup_parse_cache(file_path, content_hash)
+        if analysis is None:
+            analysis = IsolatedAnalysis(file_path, content, content_hash)
+            self._store_parse_cache(file_path, content_hash, analysis)
+        return analysis
+    
+    def _lookup_parse_cache(self, file_path: Path, content_hash: bytes) -> Optional[IsolatedAnalysis]:
+        """Get a cached analysis, marking it as recently used."""
+        key = (file_path, content_hash)
+        analysis = self._parse_cache.get(key)
+        if analysis is not None:
+            self._parse_cache.move_to_end(key)
+        return analysis
+    
+    def _store_parse_cache(self, file_path: Path, content_hash: bytes, analysis: IsolatedAnalysis) -> None:
+        """Cache an analysis, evicting the least recently used entry if full."""
+        self._parse_cache[(file_path, content_hash)] = analysis
+        if len(self._parse_cache) > self.PARSE_CACHE_SIZE:
+            self._parse_cache.popitem(last=False)
     
     def _analyze_cross_file_references(self, file_path: Path) -> None:
         """Analyze cross-file symbol references."""
@@ -545,12 +1039,13 @@ class DeviceAnalysis:
         if not analysis:
             return
         
-        # Build global symbol table
-        self._build_global_symbol_table()
+        # Drop import errors from a previous pass over a cached analysis
+        analysis.errors = [e for e in analysis.errors if e.kind != DMLErrorKind.IMPORT_ERROR]
         
         # Resolve imports and references
+        include_paths = self._get_include_paths(file_path)
         for import_name in analysis.imports:
-            if not self._resolve_import(file_path, import_name):
+            if not self._resolve_import(file_path, import_name, include_paths):
                 error = DMLError(
                     kind=DMLErrorKind.IMPORT_ERROR,
                     message=f"Cannot resolve import '{import_name}'",
@@ -558,91 +1053,208 @@ class DeviceAnalysis:
                 )
                 analysis.errors.append(error)
     
-    def _build_global_symbol_table(self) -> None:
-        """Build a global symbol table from all analyzed files."""
-        self.global_symbol_table.clear()
-        
-        for file_path, analysis in self.file_analyses.items():
-            # Use the new symbol_definitions attribute
-            symbol_table = getattr(analysis, 'symbol_definitions', {})
-            for symbol_name, symbol_def in symbol_table.items():
-                if symbol_name not in self.global_symbol_table:
-                    self.global_symbol_table[symbol_name] = []
-                self.global_symbol_table[symbol_name].append(symbol_def)
-            
-            # Also register symbols in the enhanced symbol table
-            if hasattr(analysis, 'root_scope'):
-                scope = self.symbol_table.create_file_scope(file_path, analysis.root_scope.span)
-                for symbol in analysis.symbols:
-                    scope.add_symbol(symbol)
+    def _set_file_analysis(self, file_path: Path, analysis: IsolatedAnalysis) -> None:
+        """Record the analysis of a file and merge its symbols into the global tables."""
+        self.file_analyses[file_path] = analysis
+        
+        # Only the changed file's entries are touched, not the whole table
+        if self._merged_analyses.get(file_path) is analysis:
+            return
+        self._remove_file_symbols(file_path)
+        self._merged_analyses[file_path] = analysis
+        
+        # Use the new symbol_definitions attribute
+        symbol_table = getattr(analysis, 'symbol_definitions', {})
+        for symbol_name, symbol_def in symbol_table.items():
+            # Names repeat across files; share one string per name
+            symbol_name = sys.intern(symbol_name)
+            if symbol_name not in self.global_symbol_table:
+                self.global_symbol_table[symbol_name] = []
+            self.global_symbol_table[symbol_name].append(symbol_def)
+        
+        # Also register symbols in the enhanced symbol table
+        if hasattr(analysis, 'root_scope'):
+            scope = self.symbol_table.create_file_scope(file_path, analysis.root_scope.span)
+            for symbol in analysis.symbols:
+                scope.add_symbol(symbol)
+    
+    def _drop_file_analysis(self, file_path: Path) -> None:
+        """Forget the analysis of a file and the symbols it contributed."""
+        with self._analysis_lock:
+            self.file_analyses.pop(file_path, None)
+            self._remove_file_symbols(file_path)
+            self.symbol_table.remove_file_scope(file_path)
+    
+    def _remove_file_symbols(self, file_path: Path) -> None:
+        """Remove the definitions a file contributed to the global symbol table."""
+        analysis = self._merged_analyses.pop(file_path, None)
+        if analysis is None:
+            return
+        
+        for symbol_name, symbol_def in getattr(analysis, 'symbol_definitions', {}).items():
+            definitions = self.global_symbol_table.get(symbol_name)
+            if definitions is None:
+                continue
+            remaining = [definition for definition in definitions if definition is not symbol_def]
+            if remaining:
+                self.global_symbol_table[symbol_name] = remaining
+            else:
+                del self.global_symbol_table[symbol_name]
     
-    def _resolve_import(self, file_path: Path, import_name: str) -> bool:
+    def _get_include_paths(self, file_path: Path) -> Tuple[Path, ...]:
+        """Get the include paths for a file, computing them once per configuration."""
+        if self._include_cache_revision != self.config.revision:
+            self._include_cache.clear()
+            self._import_cache.clear()
+            self._include_cache_revision = self.config.revision
+        
+        include_paths = self._include_cache.get(file_path)
+        if include_paths is None:
+            include_paths = tuple(self.config.get_include_paths_for_file(file_path))
+            self._include_cache[file_path] = include_paths
+        return include_paths
+    
+    def _resolve_import(self, file_path: Path, import_name: str,
+                        include_paths: Sequence[Path]) -> bool:
         """Try to resolve an import."""
+        key = (file_path, import_name)
+        resolved = self._import_cache.get(key)
+        if resolved is None:
+            resolved = self._lookup_import(file_path, import_name, include_paths)
+            self._import_cache[key] = resolved
+        return resolved
+    
+    def _lookup_import(self, file_path: Path, import_name: str,
+                       include_paths: Sequence[Path]) -> bool:
+        """Check whether an import names an existing file."""
         # This would involve looking up the import in include paths
         # and checking if the imported file exists and has been analyzed
-        include_paths = self.config.get_include_paths_for_file(file_path)
-        
         for include_path in include_paths:
-            import_file = include_path / import_name
-            if import_file.exists():
+            if self._file_in_directory(include_path / import_name):
                 return True
         
         # Also check relative to current file
         current_dir = file_path.parent
-        import_file = current_dir / import_name
-        return import_file.exists()
+        return self._file_in_directory(current_dir / import_name)
+    
+    def _file_in_directory(self, path: Path) -> bool:
+        """Check whether a file exists using a cached listing of its directory."""
+        return path.name in self._listdir(path.parent)
+    
+    def _listdir(self, directory: Path) -> FrozenSet[str]:
+        """Get the file names in a directory, listing it only once."""
+        entries = self._dir_cache.get(directory)
+        if entries is None:
+            try:
+                # DirEntry carries the file type from the listing itself,
+                # so filtering out subdirectories costs no extra stat calls
+                with os.scandir(directory) as it:
+                    entries = frozenset(entry.name for entry in it if entry.is_file())
+            except OSError:
+                entries = frozenset()
+            self._dir_cache[directory] = entries
+        return entries
     
     def get_symbol_at_position(self, file_path: Path, position: ZeroPosition) -> Optional[DMLSymbol]:
         """Get symbol at position in a file."""
-        analysis = self.file_analyses.get(file_path.resolve())
+        with self._analysis_lock:
+            analysis = self.file_analyses.get(self._resolve(file_path))
         if analysis:
             return analysis.get_symbol_at_position(position)
         return None
     
     def find_symbol_definitions(self, symbol_name: str) -> List[SymbolDefinition]:
         """Find all definitions of a symbol across all files."""
-        return self.global_symbol_table.get(symbol_name, [])
+        with self._analysis_lock:
+            return list(self.global_symbol_table.get(symbol_name, []))
     
     def get_all_symbols_in_file(self, file_path: Path) -> List[DMLSymbol]:
         """Get all symbols in a file."""
-        analysis = self.file_analyses.get(file_path.resolve())
+        with self._analysis_lock:
+            analysis = self.file_analyses.get(self._resolve(file_path))
         if analysis:
             return analysis.symbols
         return []
     
     def get_diagnostics_for_file(self, file_path: Path) -> List[DMLDiagnostic]:
         """Get diagnostics for a specific file."""
-        analysis = self.file_analyses.get(file_path.resolve())
+        with self._analysis_lock:
+            analysis = self.file_analyses.get(self._resolve(file_path))
         if analysis:
             return analysis.get_diagnostics()
         return []
     
+    def iter_all_diagnostics(self) -> Iterator[Tuple[Path, List[DMLDiagnostic]]]:
+        """Yield diagnostics for each analyzed file, converting them on demand."""
+        with self._analysis_lock:
+            analyses = list(self.file_analyses.items())
+        for file_path, analysis in analyses:
+            yield file_path, [error.to_diagnostic() for error in analysis.errors]
+    
     def get_all_diagnostics(self) -> Dict[Path, List[DMLDiagnostic]]:
         """Get diagnostics for all analyzed files."""
-        diagnostics = {}
-        for file_path, analysis in self.file_analyses.items():
-            diagnostics[file_path] = analysis.get_diagnostics()
-        return diagnostics
+        return dict(self.iter_all_diagnostics())
     
-    def invalidate_file(self, file_path: Path) -> Set[Path]:
-        """Invalidate analysis for a file and return affected files."""
-        file_path = file_path.resolve()
+    def invalidate_file(self, file_path: Path, content: Optional[str] = None) -> Set[Path]:
+        """
+        Invalidate analysis for a file and return affected files.
         
-        # Get all files that depend on this file
-        affected_files = self.file_manager.get_all_dependents(file_path)
-        affected_files.add(file_path)
+        Nothing is invalidated if the file still has the content it was
+        analyzed with.
+        
+        Args:
+            file_path: Path to the changed file
+            content: New content of the file, read from disk if not given
+            
+        Returns:
+            Set of files whose analyses were dropped
+        """
+        # Analyses run on timer threads; keep them out while the caches change
+        with self._analysis_lock:
+            file_path = self._resolve(file_path)
+            if self._is_unchanged(file_path, content):
+                return set()
+            
+            # The file may have been moved or replaced by a symlink
+            for raw_path in [raw for raw, resolved in list(self._resolved_paths.items()) if resolved == file_path]:
+                del self._resolved_paths[raw_path]
+            
+            # The file may have been created or deleted, changing its directory listing
+            for directory in [d for d in list(self._dir_cache) if self._resolve(d) == file_path.parent]:
+                del self._dir_cache[directory]
+            self._import_cache.clear()
+            
+            # Get all files that depend on this file
+            affected_files = self.file_manager.get_all_dependents(file_path)
+            affected_files.add(file_path)
+            
+            # Remove analyses for affected files
+            for affected_file in affected_files:
+                self._drop_file_analysis(affected_file)
+            
+            return affected_files
+    
+    def _is_unchanged(self, file_path: Path, content: Optional[str]) -> bool:
+        """Check whether a file still has the content it was analyzed with."""
+        analysis = self.file_analyses.get(file_path)
+        if analysis is None:
+            return False
         
-        # Remove analyses for affected files
-        for affected_file in affected_files:
-            self.file_analyses.pop(affected_file, None)
+        if content is None:
+            try:
+                # Not read again while its mtime and size are unchanged
+                content = self.file_manager.read_cached(file_path)
+            except (OSError, UnicodeDecodeError):
+                return False
         
-        return affected_files
+        return content == analysis.content
 
 
 # Export main classes
 __all__ = [
     "IsolatedAnalysis",
     "DeviceAnalysis", 
+    "compute_content_hash",
     "DMLError",
     "DMLErrorKind",
     "SymbolReference",
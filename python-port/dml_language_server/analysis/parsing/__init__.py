@@ -8,10 +8,12 @@ SPDX-License-Identifier: Apache-2.0 and MIT
 """
 
 import re
+import sys
 import logging
-from typing import List, Optional, Dict, Any, Iterator, NamedTuple
+from array import array
+from typing import Callable, List, Optional, Dict, Any, Iterator, NamedTuple
 from enum import Enum
-from dataclasses import dataclass
+from types import SimpleNamespace
 
 from ...span import ZeroSpan, ZeroPosition, ZeroRange, SpanBuilder
 from ...lsp_data import DMLSymbol, DMLSymbolKind, DMLLocation
@@ -19,6 +21,26 @@ from .. import DMLError, DMLErrorKind
 
 logger = logging.getLogger(__name__)
 
+# Well-formed tokens, matched in a single C-level call. Block comments match
+# only their opener; the scanner finds the terminator with str.find, which
+# is much faster than a lazy .*? over a long comment. Anything this does
+# not match (malformed strings and numbers, unterminated block comments,
+# non-ASCII identifiers, unknown characters) falls back to the character
+# reader in DMLLexer._next_token, which owns the error reporting.
+_TOKEN_RE = re.compile(r"""
+    (?P<whitespace>\s+)
+  | (?P<line_comment>//[^\n]*)
+  | (?P<block_comment>/\*)
+  | (?P<string>"(?:[^"\\\n]|\\[nrt\\"'])*")
+  | (?P<number>0[xX][0-9a-fA-F]+|\d+(?:\.\d*)?(?:[eE][+-]?\d*)?)
+  | (?P<identifier>[A-Za-z_]\w*)
+  | (?P<punctuation>[=;:,.@{}()\[\]])
+""", re.VERBOSE | re.DOTALL)
+
+# Patterns for the character reader's individual token kinds.
+_WHITESPACE_RE = re.compile(r"\s+")
+_IDENTIFIER_RE = re.compile(r"\w+")
+
 
 class TokenType(Enum):
     """Types of DML tokens."""
@@ -70,17 +92,71 @@ class TokenType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# Small-integer token kinds. The scanner and parser compare these instead
+# of TokenType members, whose class attribute lookup goes through the Enum
+# metaclass; _TOKEN_TYPES maps a kind back to its TokenType.
+_TOKEN_TYPES = tuple(TokenType)
+_TOKEN_KINDS = {token_type: kind for kind, token_type in enumerate(_TOKEN_TYPES)}
+TK = SimpleNamespace(**{token_type.name: kind for token_type, kind in _TOKEN_KINDS.items()})
+
+
 class Token:
-    """A token from DML source code."""
-    type: TokenType
-    value: str
-    span: ZeroSpan
+    """A token from DML source code.
+    
+    Tokens from the scanner record only their start offset and the span
+    builder of their source; the ZeroSpan is built on first access. The
+    parser reads spans for declaration names and errors only.
+    """
+    
+    __slots__ = ('type', 'value', '_span', '_span_builder', '_start')
+    
+    def __init__(self, type: TokenType, value: str, span: Optional[ZeroSpan] = None,
+                 span_builder: Optional[SpanBuilder] = None, start: int = 0):
+        self.type = type
+        self.value = value
+        self._span = span
+        self._span_builder = span_builder
+        self._start = start
+    
+    @property
+    def span(self) -> ZeroSpan:
+        span = self._span
+        if span is None:
+            start = self._start
+            span = self._span = self._span_builder.span_from_offsets(start, start + len(self.value))
+        return span
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Token):
+            return NotImplemented
+        return (self.type, self.value, self.span) == (other.type, other.value, other.span)
+    
+    def __repr__(self) -> str:
+        return f"Token(type={self.type!r}, value={self.value!r}, span={self.span!r})"
     
     def __str__(self) -> str:
         return f"{self.type.value}({self.value!r}) at {self.span}"
 
 
+class TokenArrays(NamedTuple):
+    """A token stream stored as parallel arrays.
+    
+    Entry i of kinds, values and starts describes token i: its TK kind,
+    its text and the offset it starts at. Every value is a slice of the
+    source, so a token ends at its start plus len(value); span_builder
+    turns offsets into positions when a span is needed.
+    """
+    span_builder: SpanBuilder
+    kinds: array
+    values: List[str]
+    starts: array
+    
+    def token(self, index: int) -> Token:
+        """Materialize token index as a Token."""
+        return Token(_TOKEN_TYPES[self.kinds[index]], self.values[index], None,
+                     self.span_builder, self.starts[index])
+
+
 class DMLLexer:
     """Lexical analyzer for DML code with enhanced error recovery."""
     
@@ -107,43 +183,147 @@ class DMLLexer:
         'layout': TokenType.LAYOUT,
     }
     
+    SINGLE_CHARS = {
+        '=': TokenType.EQUALS,
+        ';': TokenType.SEMICOLON,
+        ':': TokenType.COLON,
+        ',': TokenType.COMMA,
+        '.': TokenType.DOT,
+        '@': TokenType.AT,
+        '{': TokenType.LBRACE,
+        '}': TokenType.RBRACE,
+        '(': TokenType.LPAREN,
+        ')': TokenType.RPAREN,
+        '[': TokenType.LBRACKET,
+        ']': TokenType.RBRACKET,
+    }
+    
+    # Keyword -> (TK kind, shared value), so every occurrence of a keyword
+    # reuses the one interned string held here.
+    _KEYWORD_TOKENS = {word: (_TOKEN_KINDS[token_type], word) for word, token_type in KEYWORDS.items()}
+    _SINGLE_CHAR_KINDS = {char: _TOKEN_KINDS[token_type] for char, token_type in SINGLE_CHARS.items()}
+    
     def __init__(self, content: str, file_path: str):
         self.content = content
         self.file_path = file_path
         self.position = 0
-        self.line = 0
-        self.column = 0
         self.span_builder = SpanBuilder(file_path)
         self.span_builder.set_content(content)
         self.errors: List[DMLError] = []
         self._in_error_recovery = False
+    
+    @property
+    def line(self) -> int:
+        """Zero-based line of the current position."""
+        return self._position_at(self.position).line
+    
+    @property
+    def column(self) -> int:
+        """Zero-based column of the current position."""
+        return self._position_at(self.position).column
+    
+    def _position_at(self, offset: int) -> ZeroPosition:
+        """Convert a content offset to a position via the line-start table."""
+        return self.span_builder.position_from_offset(offset)
         
     def tokenize(self) -> List[Token]:
         """Tokenize the content into a list of tokens with error recovery."""
-        tokens = []
-        
-        while self.position < len(self.content):
-            try:
-                token = self._next_token()
-                if token:
-                    # Skip whitespace and comments for now
-                    if token.type not in (TokenType.WHITESPACE, TokenType.COMMENT):
-                        tokens.append(token)
-                self._in_error_recovery = False
-            except Exception as e:
-                # Error recovery: skip to next token boundary
-                if not self._in_error_recovery:
-                    self._report_error(f"Lexical error: {e}", 
-                                     ZeroPosition(self.line, self.column))
-                    self._in_error_recovery = True
-                self._advance()
+        scanned = self.scan()
+        return [scanned.token(index) for index in range(len(scanned.kinds))]
+    
+    def scan(self) -> TokenArrays:
+        """Tokenize the content into parallel arrays with error recovery."""
+        kinds = array('b')
+        values: List[str] = []
+        starts = array('i')
+        add_kind = kinds.append
+        add_value = values.append
+        add_start = starts.append
+        content = self.content
+        length = len(content)
+        match = _TOKEN_RE.match
+        keywords = self._KEYWORD_TOKENS
+        intern = sys.intern
+        single_chars = self._SINGLE_CHAR_KINDS
+        identifier, number, string = TK.IDENTIFIER, TK.NUMBER, TK.STRING
+        
+        # The scan position lives in a local and is written back to the
+        # instance only around calls into the character reader. Line and
+        # column are never tracked; they are derived from offsets on demand.
+        pos = self.position
+        recovering = self._in_error_recovery
+        
+        while pos < length:
+            m = match(content, pos)
+            if m is not None:
+                kind = m.lastgroup
+                end = m.end()
+                # A number running into letters or a second '.' is malformed;
+                # leave it to _read_number so the error gets reported.
+                if (kind == 'number' and end < length and
+                        (content[end].isalnum() or content[end] == '.')):
+                    m = None
+                elif kind == 'block_comment':
+                    end = content.find('*/', end)
+                    if end < 0:
+                        # Unterminated; _read_block_comment reports it
+                        m = None
+                    else:
+                        end += 2
+            
+            if m is None:
+                self.position = pos
+                self._in_error_recovery = recovering
+                try:
+                    token = self._next_token()
+                    if token:
+                        # Skip whitespace and comments for now
+                        if token.type not in (TokenType.WHITESPACE, TokenType.COMMENT):
+                            add_kind(_TOKEN_KINDS[token.type])
+                            add_value(token.value)
+                            add_start(pos)
+                    self._in_error_recovery = False
+                except Exception as e:
+                    # Error recovery: skip to next token boundary
+                    if not self._in_error_recovery:
+                        self._report_error(f"Lexical error: {e}", 
+                                         self._position_at(self.position))
+                        self._in_error_recovery = True
+                    self._advance()
+                pos = self.position
+                recovering = self._in_error_recovery
+                continue
+            
+            if kind != 'whitespace' and kind != 'line_comment' and kind != 'block_comment':
+                value = m.group()
+                if kind == 'identifier':
+                    keyword = keywords.get(value)
+                    if keyword is None:
+                        add_kind(identifier)
+                        value = intern(value)
+                    else:
+                        token_kind, value = keyword
+                        add_kind(token_kind)
+                elif kind == 'punctuation':
+                    add_kind(single_chars[value])
+                elif kind == 'number':
+                    add_kind(number)
+                else:
+                    add_kind(string)
+                add_value(value)
+                add_start(pos)
+            pos = end
+            recovering = False
+        
+        self.position = pos
+        self._in_error_recovery = recovering
         
         # Add EOF token
-        eof_pos = ZeroPosition(self.line, self.column)
-        eof_span = ZeroSpan(self.file_path, ZeroRange(eof_pos, eof_pos))
-        tokens.append(Token(TokenType.EOF, "", eof_span))
+        add_kind(TK.EOF)
+        add_value("")
+        add_start(pos)
         
-        return tokens
+        return TokenArrays(self.span_builder, kinds, values, starts)
     
     def _report_error(self, message: str, pos: ZeroPosition) -> None:
         """Report a lexical error."""
@@ -187,36 +367,11 @@ class DMLLexer:
         if self._current_char().isalpha() or self._current_char() == '_':
             return self._read_identifier()
         
-        # Single character tokens
-        single_char_tokens = {
-            '=': TokenType.EQUALS,
-            ';': TokenType.SEMICOLON,
-            ':': TokenType.COLON,
-            ',': TokenType.COMMA,
-            '.': TokenType.DOT,
-            '@': TokenType.AT,
-            '{': TokenType.LBRACE,
-            '}': TokenType.RBRACE,
-            '(': TokenType.LPAREN,
-            ')': TokenType.RPAREN,
-            '[': TokenType.LBRACKET,
-            ']': TokenType.RBRACKET,
-        }
-        
+        # Single character tokens, or an unknown character
         char = self._current_char()
-        if char in single_char_tokens:
-            start_pos = ZeroPosition(self.line, self.column)
-            self._advance()
-            end_pos = ZeroPosition(self.line, self.column)
-            span = ZeroSpan(self.file_path, ZeroRange(start_pos, end_pos))
-            return Token(single_char_tokens[char], char, span)
-        
-        # Unknown character
-        start_pos = ZeroPosition(self.line, self.column)
+        start = self.position
         self._advance()
-        end_pos = ZeroPosition(self.line, self.column)
-        span = ZeroSpan(self.file_path, ZeroRange(start_pos, end_pos))
-        return Token(TokenType.UNKNOWN, char, span)
+        return self._token(self.SINGLE_CHARS.get(char, TokenType.UNKNOWN), char, start)
     
     def _current_char(self) -> str:
         """Get the current character."""
@@ -233,188 +388,144 @@ class DMLLexer:
     def _advance(self) -> None:
         """Advance to the next character."""
         if self.position < len(self.content):
-            if self.content[self.position] == '\n':
-                self.line += 1
-                self.column = 0
-            else:
-                self.column += 1
             self.position += 1
     
+    def _advance_by(self, count: int) -> None:
+        """Advance over the next count characters in one step."""
+        self.position = min(self.position + count, len(self.content))
+    
+    def _token(self, token_type: TokenType, value: str, start: int) -> Token:
+        """Build a token for value, which starts at offset start."""
+        return Token(token_type, value, None, self.span_builder, start)
+    
     def _read_whitespace(self) -> Token:
         """Read whitespace characters."""
-        start_pos = ZeroPosition(self.line, self.column)
-        value = ""
+        start = self.position
+        value = _WHITESPACE_RE.match(self.content, start).group()
+        self._advance_by(len(value))
         
-        while self.position < len(self.content) and self._current_char().isspace():
-            value += self._current_char()
-            self._advance()
-        
-        end_pos = ZeroPosition(self.line, self.column)
-        span = ZeroSpan(self.file_path, ZeroRange(start_pos, end_pos))
-        return Token(TokenType.WHITESPACE, value, span)
+        return self._token(TokenType.WHITESPACE, value, start)
     
     def _read_line_comment(self) -> Token:
         """Read a line comment."""
-        start_pos = ZeroPosition(self.line, self.column)
-        value = ""
-        
-        while self.position < len(self.content) and self._current_char() != '\n':
-            value += self._current_char()
-            self._advance()
+        start = self.position
+        end = self.content.find('\n', start)
+        if end < 0:
+            end = len(self.content)
+        value = self.content[start:end]
+        self._advance_by(end - start)
         
-        end_pos = ZeroPosition(self.line, self.column)
-        span = ZeroSpan(self.file_path, ZeroRange(start_pos, end_pos))
-        return Token(TokenType.COMMENT, value, span)
+        return self._token(TokenType.COMMENT, value, start)
     
     def _read_block_comment(self) -> Token:
         """Read a block comment with unterminated check."""
-        start_pos = ZeroPosition(self.line, self.column)
-        value = ""
-        
-        # Skip /*
-        value += self._current_char()
-        self._advance()
-        value += self._current_char()
-        self._advance()
-        
-        terminated = False
-        while self.position < len(self.content):
-            if self._current_char() == '*' and self._peek_char() == '/':
-                value += self._current_char()
-                self._advance()
-                value += self._current_char()
-                self._advance()
-                terminated = True
-                break
-            value += self._current_char()
-            self._advance()
+        start = self.position
+        end = self.content.find('*/', start + 2)
+        terminated = end >= 0
+        end = end + 2 if terminated else len(self.content)
+        value = self.content[start:end]
+        self._advance_by(end - start)
         
         if not terminated:
-            self._report_error("Unterminated block comment (missing */)", start_pos)
+            self._report_error("Unterminated block comment (missing */)", self._position_at(start))
         
-        end_pos = ZeroPosition(self.line, self.column)
-        span = ZeroSpan(self.file_path, ZeroRange(start_pos, end_pos))
-        return Token(TokenType.COMMENT, value, span)
+        return self._token(TokenType.COMMENT, value, start)
     
     def _read_string(self) -> Token:
         """Read a string literal with error recovery."""
-        start_pos = ZeroPosition(self.line, self.column)
-        start_line = self.line
-        value = ""
+        content = self.content
+        length = len(content)
+        start = self.position
         
         # Skip opening quote
-        value += self._current_char()
-        self._advance()
+        pos = start + 1
         
         unterminated = False
-        while self.position < len(self.content) and self._current_char() != '"':
+        while pos < length and content[pos] != '"':
             # Check for unterminated string on new line
-            if self._current_char() == '\n':
+            if content[pos] == '\n':
                 unterminated = True
                 break
                 
-            if self._current_char() == '\\':
-                value += self._current_char()
-                self._advance()
-                if self.position < len(self.content):
+            if content[pos] == '\\':
+                pos += 1
+                if pos < length:
                     # Validate escape sequence
-                    escape_char = self._current_char()
+                    escape_char = content[pos]
                     if escape_char not in 'nrt\\"\'':
                         self._report_error(f"Invalid escape sequence: \\{escape_char}", 
-                                         ZeroPosition(self.line, self.column))
-                    value += escape_char
-                    self._advance()
+                                         self._position_at(pos))
+                    pos += 1
             else:
-                value += self._current_char()
-                self._advance()
+                pos += 1
         
         # Skip closing quote if present
-        if self.position < len(self.content) and self._current_char() == '"':
-            value += self._current_char()
-            self._advance()
+        if pos < length and content[pos] == '"':
+            pos += 1
         elif unterminated:
-            self._report_error("Unterminated string literal (cannot span multiple lines)", start_pos)
+            self._report_error("Unterminated string literal (cannot span multiple lines)", self._position_at(start))
         else:
-            self._report_error("Unterminated string literal (missing closing quote)", start_pos)
+            self._report_error("Unterminated string literal (missing closing quote)", self._position_at(start))
         
-        end_pos = ZeroPosition(self.line, self.column)
-        span = ZeroSpan(self.file_path, ZeroRange(start_pos, end_pos))
-        return Token(TokenType.STRING, value, span)
+        self.position = pos
+        return self._token(TokenType.STRING, content[start:pos], start)
     
     def _read_number(self) -> Token:
         """Read a number literal with validation."""
-        start_pos = ZeroPosition(self.line, self.column)
-        value = ""
-        has_hex = False
+        content = self.content
+        length = len(content)
+        start = pos = self.position
         has_decimal = False
         
         # Check for hex prefix
-        if self._current_char() == '0' and self._peek_char() in 'xX':
-            has_hex = True
-            value += self._current_char()
-            self._advance()
-            value += self._current_char()
-            self._advance()
+        if content[pos] == '0' and pos + 1 < length and content[pos + 1] in 'xX':
+            pos += 2
             
             # Read hex digits
-            if not self._current_char().isdigit() and self._current_char().lower() not in 'abcdef':
-                self._report_error("Invalid hexadecimal number: expected hex digit after 0x", start_pos)
+            if pos >= length or (not content[pos].isdigit() and
+                                 content[pos].lower() not in 'abcdef'):
+                self._report_error("Invalid hexadecimal number: expected hex digit after 0x", self._position_at(start))
             
-            while (self.position < len(self.content) and 
-                   (self._current_char().isdigit() or self._current_char().lower() in 'abcdef')):
-                value += self._current_char()
-                self._advance()
+            while (pos < length and 
+                   (content[pos].isdigit() or content[pos].lower() in 'abcdef')):
+                pos += 1
         else:
             # Read decimal number
-            while (self.position < len(self.content) and 
-                   (self._current_char().isdigit() or self._current_char() == '.')):
-                if self._current_char() == '.':
+            while pos < length and (content[pos].isdigit() or content[pos] == '.'):
+                if content[pos] == '.':
                     if has_decimal:
-                        self._report_error("Invalid number: multiple decimal points", start_pos)
+                        self._report_error("Invalid number: multiple decimal points", self._position_at(start))
                         break
                     has_decimal = True
-                value += self._current_char()
-                self._advance()
+                pos += 1
             
             # Check for scientific notation
-            if self.position < len(self.content) and self._current_char() in 'eE':
-                value += self._current_char()
-                self._advance()
-                if self.position < len(self.content) and self._current_char() in '+-':
-                    value += self._current_char()
-                    self._advance()
-                while (self.position < len(self.content) and self._current_char().isdigit()):
-                    value += self._current_char()
-                    self._advance()
+            if pos < length and content[pos] in 'eE':
+                pos += 1
+                if pos < length and content[pos] in '+-':
+                    pos += 1
+                while pos < length and content[pos].isdigit():
+                    pos += 1
         
         # Check for invalid suffix
-        if self.position < len(self.content) and self._current_char().isalpha():
-            suffix_start = self.position
-            while (self.position < len(self.content) and self._current_char().isalnum()):
-                value += self._current_char()
-                self._advance()
-            self._report_error(f"Invalid number suffix in '{value}'", start_pos)
+        if pos < length and content[pos].isalpha():
+            while pos < length and content[pos].isalnum():
+                pos += 1
+            self._report_error(f"Invalid number suffix in '{content[start:pos]}'", self._position_at(start))
         
-        end_pos = ZeroPosition(self.line, self.column)
-        span = ZeroSpan(self.file_path, ZeroRange(start_pos, end_pos))
-        return Token(TokenType.NUMBER, value, span)
+        self._advance_by(pos - start)
+        return self._token(TokenType.NUMBER, content[start:pos], start)
     
     def _read_identifier(self) -> Token:
         """Read an identifier or keyword."""
-        start_pos = ZeroPosition(self.line, self.column)
-        value = ""
-        
-        while (self.position < len(self.content) and 
-               (self._current_char().isalnum() or self._current_char() == '_')):
-            value += self._current_char()
-            self._advance()
+        start = self.position
+        value = sys.intern(_IDENTIFIER_RE.match(self.content, start).group())
+        self._advance_by(len(value))
         
         # Check if it's a keyword
         token_type = self.KEYWORDS.get(value, TokenType.IDENTIFIER)
         
-        end_pos = ZeroPosition(self.line, self.column)
-        span = ZeroSpan(self.file_path, ZeroRange(start_pos, end_pos))
-        return Token(token_type, value, span)
+        return self._token(token_type, value, start)
 
 
 class DMLParser:
@@ -426,12 +537,17 @@ class DMLParser:
         TokenType.TYPEDEF, TokenType.STRUCT, TokenType.SEMICOLON,
         TokenType.RBRACE, TokenType.EOF
     }
+    _SYNC_KINDS = frozenset(_TOKEN_KINDS[token_type] for token_type in SYNC_TOKENS)
     
     def __init__(self, content: str, file_path: str):
         self.content = content
         self.file_path = file_path
         self.lexer = DMLLexer(content, file_path)
-        self.tokens = self.lexer.tokenize()
+        # The parser mostly compares token types, so it reads the lexer's
+        # parallel arrays and only builds Token objects when it needs one.
+        self._scanned = self.lexer.scan()
+        self._kinds = self._scanned.kinds
+        self._values = self._scanned.values
         self.position = 0
         self.errors: List[DMLError] = []
         self.symbols: List[DMLSymbol] = []
@@ -441,12 +557,26 @@ class DMLParser:
         self._error_count = 0
         self._max_errors = 100  # Stop parsing after too many errors
         
+        # Top-level declaration parsers keyed by the TK kind of their keyword
+        self._top_dispatch = {
+            TK.DML: self._parse_dml_version,
+            TK.IMPORT: self._parse_import,
+            TK.DEVICE: self._parse_device,
+            TK.TEMPLATE: self._parse_template,
+            TK.TYPEDEF: self._parse_typedef,
+        }
+        
         # Collect lexer errors
         self.errors.extend(self.lexer.get_errors())
         
         # Parse the content
         self._parse()
     
+    @property
+    def tokens(self) -> List[Token]:
+        """All tokens, materialized from the scanned arrays."""
+        return [self._scanned.token(index) for index in range(len(self._kinds))]
+    
     def _parse(self) -> None:
         """Parse the token stream with error recovery."""
         try:
@@ -470,14 +600,12 @@ class DMLParser:
         
         while not self._is_at_end():
             # Look for synchronization points
-            current = self._current_token()
-            
-            if current.type in self.SYNC_TOKENS:
+            if self._current_kind() in self._SYNC_KINDS:
                 self._in_panic_mode = False
                 return
             
             # Also sync on new declarations that might start on next line
-            if self._previous_token().type == TokenType.SEMICOLON:
+            if self._kinds[self.position - 1] == TK.SEMICOLON:
                 self._in_panic_mode = False
                 return
             
@@ -491,13 +619,11 @@ class DMLParser:
         # Add context from surrounding tokens
         context_tokens = []
         start_idx = max(0, self.position - 2)
-        end_idx = min(len(self.tokens), self.position + 3)
+        end_idx = min(len(self._kinds), self.position + 3)
         
         for i in range(start_idx, end_idx):
-            if i < len(self.tokens):
-                token = self.tokens[i]
-                marker = " -> " if i == self.position else "    "
-                context_tokens.append(f"{marker}{token.type.value}: '{token.value}'")
+            marker = " -> " if i == self.position else "    "
+            context_tokens.append(f"{marker}{_TOKEN_TYPES[self._kinds[i]].value}: '{self._values[i]}'")
         
         context_str = "\n".join(context_tokens) if context_tokens else ""
         detailed_message = f"{message}\nContext:\n{context_str}" if context_str else message
@@ -513,50 +639,36 @@ class DMLParser:
     
     def _parse_top_level(self) -> None:
         """Parse a top-level declaration."""
-        token = self._current_token()
-        
-        if token.type == TokenType.DML:
-            self._parse_dml_version()
-        elif token.type == TokenType.IMPORT:
-            self._parse_import()
-        elif token.type == TokenType.DEVICE:
-            self._parse_device()
-        elif token.type == TokenType.TEMPLATE:
-            self._parse_template()
-        elif token.type == TokenType.TYPEDEF:
-            self._parse_typedef()
-        else:
-            # Skip unknown tokens
-            self._advance()
+        # Unknown tokens are skipped
+        self._top_dispatch.get(self._current_kind(), self._advance)()
     
     def _parse_dml_version(self) -> None:
         """Parse DML version declaration."""
         self._advance()  # Skip 'dml'
         
-        if self._current_token().type == TokenType.NUMBER:
-            self.dml_version = self._current_token().value
+        if self._current_kind() == TK.NUMBER:
+            self.dml_version = self._current_value()
             self._advance()
         
-        self._expect(TokenType.SEMICOLON)
+        self._expect(TK.SEMICOLON)
     
     def _parse_import(self) -> None:
         """Parse import statement."""
         self._advance()  # Skip 'import'
         
-        if self._current_token().type == TokenType.STRING:
-            import_path = self._current_token().value.strip('"')
+        if self._current_kind() == TK.STRING:
+            import_path = self._current_value().strip('"')
             self.imports.append(import_path)
             self._advance()
         
-        self._expect(TokenType.SEMICOLON)
+        self._expect(TK.SEMICOLON)
     
     def _parse_device(self) -> None:
         """Parse device declaration."""
-        start_token = self._current_token()
         self._advance()  # Skip 'device'
         
-        if self._current_token().type == TokenType.IDENTIFIER:
-            name = self._current_token().value
+        if self._current_kind() == TK.IDENTIFIER:
+            name = self._current_value()
             name_span = self._current_token().span
             self._advance()
             
@@ -571,16 +683,15 @@ class DMLParser:
             self.symbols.append(symbol)
             
             # Parse device body
-            if self._current_token().type == TokenType.LBRACE:
+            if self._current_kind() == TK.LBRACE:
                 self._parse_block(symbol)
     
     def _parse_template(self) -> None:
         """Parse template declaration."""
-        start_token = self._current_token()
         self._advance()  # Skip 'template'
         
-        if self._current_token().type == TokenType.IDENTIFIER:
-            name = self._current_token().value
+        if self._current_kind() == TK.IDENTIFIER:
+            name = self._current_value()
             name_span = self._current_token().span
             self._advance()
             
@@ -595,15 +706,15 @@ class DMLParser:
             self.symbols.append(symbol)
             
             # Parse template body
-            if self._current_token().type == TokenType.LBRACE:
+            if self._current_kind() == TK.LBRACE:
                 self._parse_block(symbol)
     
     def _parse_typedef(self) -> None:
         """Parse typedef declaration."""
         self._advance()  # Skip 'typedef'
         
-        if self._current_token().type == TokenType.IDENTIFIER:
-            name = self._current_token().value
+        if self._current_kind() == TK.IDENTIFIER:
+            name = self._current_value()
             name_span = self._current_token().span
             self._advance()
             
@@ -617,250 +728,166 @@ class DMLParser:
             )
             self.symbols.append(symbol)
         
-        self._expect(TokenType.SEMICOLON)
+        self._expect(TK.SEMICOLON)
     
     def _parse_block(self, parent_symbol: DMLSymbol) -> None:
         """Parse a block of declarations."""
-        self._expect(TokenType.LBRACE)
+        self._advance()  # Skip '{'; callers only get here on one
         
-        while not self._is_at_end() and self._current_token().type != TokenType.RBRACE:
+        kinds = self._kinds
+        eof, rbrace = TK.EOF, TK.RBRACE
+        while kinds[self.position] != eof and kinds[self.position] != rbrace:
             self._parse_block_item(parent_symbol)
         
-        self._expect(TokenType.RBRACE)
+        if kinds[self.position] == rbrace:
+            self._advance()
+        else:
+            self._expect_failed(rbrace)
     
     def _parse_block_item(self, parent_symbol: DMLSymbol) -> None:
         """Parse an item within a block."""
-        token = self._current_token()
-        
-        if token.type == TokenType.BANK:
-            self._parse_bank(parent_symbol)
-        elif token.type == TokenType.REGISTER:
-            self._parse_register(parent_symbol)
-        elif token.type == TokenType.FIELD:
-            self._parse_field(parent_symbol)
-        elif token.type == TokenType.METHOD:
-            self._parse_method(parent_symbol)
-        elif token.type == TokenType.PARAMETER:
-            self._parse_parameter(parent_symbol)
-        elif token.type == TokenType.ATTRIBUTE:
-            self._parse_attribute(parent_symbol)
+        entry = self._DECL_TABLE.get(self._current_kind())
+        if entry is not None:
+            self._parse_decl(parent_symbol, *entry)
         else:
             # Skip unknown tokens
             self._advance()
     
-    def _parse_bank(self, parent_symbol: DMLSymbol) -> None:
-        """Parse bank declaration."""
-        self._advance()  # Skip 'bank'
+    def _parse_decl(self, parent_symbol: DMLSymbol, kind: DMLSymbolKind, detail: str,
+                    has_body: bool, must_semi: bool,
+                    parse_suffix: Optional[Callable[["DMLParser"], None]]) -> None:
+        """Parse a named declaration inside a block.
         
-        if self._current_token().type == TokenType.IDENTIFIER:
-            name = self._current_token().value
-            name_span = self._current_token().span
-            self._advance()
-            
-            location = DMLLocation(name_span)
-            symbol = DMLSymbol(
-                name=name,
-                kind=DMLSymbolKind.BANK,
-                location=location,
-                detail="bank"
-            )
-            parent_symbol.children.append(symbol)
-            self.symbols.append(symbol)
-            
-            if self._current_token().type == TokenType.LBRACE:
-                self._parse_block(symbol)
-    
-    def _parse_register(self, parent_symbol: DMLSymbol) -> None:
-        """Parse register declaration."""
-        self._advance()  # Skip 'register'
+        Declarations with a body end either at the block or, when
+        must_semi is set, at a semicolon; those without one always expect
+        a semicolon, even if the name is missing.
+        """
+        self._advance()  # Skip the keyword
         
-        if self._current_token().type == TokenType.IDENTIFIER:
-            name = self._current_token().value
+        if self._current_kind() == TK.IDENTIFIER:
+            name = self._current_value()
             name_span = self._current_token().span
             self._advance()
             
-            # Skip optional @ address syntax
-            if self._current_token().type == TokenType.AT:
-                self._advance()  # Skip @
-                # Check for missing address
-                if self._current_token().type in (TokenType.LBRACE, TokenType.RBRACE, TokenType.EOF, TokenType.COMMENT):
-                    self._report_error("Expected address expression after '@'")
-                elif self._current_token().type in (TokenType.NUMBER, TokenType.IDENTIFIER):
-                    self._advance()  # Skip the address
+            if parse_suffix is not None:
+                parse_suffix(self)
             
             location = DMLLocation(name_span)
             symbol = DMLSymbol(
                 name=name,
-                kind=DMLSymbolKind.REGISTER,
+                kind=kind,
                 location=location,
-                detail="register"
+                detail=detail
             )
             parent_symbol.children.append(symbol)
             self.symbols.append(symbol)
             
-            if self._current_token().type == TokenType.LBRACE:
-                self._parse_block(symbol)
-    
-    def _parse_field(self, parent_symbol: DMLSymbol) -> None:
-        """Parse field declaration."""
-        self._advance()  # Skip 'field'
+            if has_body:
+                if self._current_kind() == TK.LBRACE:
+                    self._parse_block(symbol)
+                elif must_semi:
+                    self._expect(TK.SEMICOLON)
+                return
         
-        if self._current_token().type == TokenType.IDENTIFIER:
-            name = self._current_token().value
-            name_span = self._current_token().span
-            self._advance()
-            
-            # Skip optional @ [bits] syntax
-            if self._current_token().type == TokenType.AT:
-                self._advance()  # Skip @
-                if self._current_token().type == TokenType.LBRACKET:
-                    self._advance()  # Skip [
-                    # Skip until ]
-                    while not self._is_at_end() and self._current_token().type != TokenType.RBRACKET:
-                        self._advance()
-                    if self._current_token().type == TokenType.RBRACKET:
-                        self._advance()  # Skip ]
-            
-            location = DMLLocation(name_span)
-            symbol = DMLSymbol(
-                name=name,
-                kind=DMLSymbolKind.FIELD,
-                location=location,
-                detail="field"
-            )
-            parent_symbol.children.append(symbol)
-            self.symbols.append(symbol)
-            
-            if self._current_token().type == TokenType.LBRACE:
-                self._parse_block(symbol)
+        if must_semi and not has_body:
+            if self._kinds[self.position] == TK.SEMICOLON:
+                self._advance()
             else:
-                self._expect(TokenType.SEMICOLON)
-    
-    def _parse_method(self, parent_symbol: DMLSymbol) -> None:
-        """Parse method declaration."""
-        self._advance()  # Skip 'method'
-        
-        if self._current_token().type == TokenType.IDENTIFIER:
-            name = self._current_token().value
-            name_span = self._current_token().span
-            self._advance()
-            
-            location = DMLLocation(name_span)
-            symbol = DMLSymbol(
-                name=name,
-                kind=DMLSymbolKind.METHOD,
-                location=location,
-                detail="method"
-            )
-            parent_symbol.children.append(symbol)
-            self.symbols.append(symbol)
-            
-            if self._current_token().type == TokenType.LBRACE:
-                self._parse_block(symbol)
-    
-    def _parse_parameter(self, parent_symbol: DMLSymbol) -> None:
-        """Parse parameter declaration."""
-        self._advance()  # Skip 'parameter'
-        
-        if self._current_token().type == TokenType.IDENTIFIER:
-            name = self._current_token().value
-            name_span = self._current_token().span
-            self._advance()
-            
-            location = DMLLocation(name_span)
-            symbol = DMLSymbol(
-                name=name,
-                kind=DMLSymbolKind.PARAMETER,
-                location=location,
-                detail="parameter"
-            )
-            parent_symbol.children.append(symbol)
-            self.symbols.append(symbol)
-        
-        self._expect(TokenType.SEMICOLON)
-    
-    def _parse_attribute(self, parent_symbol: DMLSymbol) -> None:
-        """Parse attribute declaration."""
-        self._advance()  # Skip 'attribute'
-        
-        if self._current_token().type == TokenType.IDENTIFIER:
-            name = self._current_token().value
-            name_span = self._current_token().span
-            self._advance()
-            
-            location = DMLLocation(name_span)
-            symbol = DMLSymbol(
-                name=name,
-                kind=DMLSymbolKind.ATTRIBUTE,
-                location=location,
-                detail="attribute"
-            )
-            parent_symbol.children.append(symbol)
-            self.symbols.append(symbol)
-        
-        self._expect(TokenType.SEMICOLON)
+                self._expect_failed(TK.SEMICOLON)
+    
+    def _parse_register_address(self) -> None:
+        """Skip optional @ address syntax after a register name."""
+        if self._current_kind() == TK.AT:
+            self._advance()  # Skip @
+            # Check for missing address
+            if self._current_kind() in (TK.LBRACE, TK.RBRACE, TK.EOF, TK.COMMENT):
+                self._report_error("Expected address expression after '@'")
+            elif self._current_kind() in (TK.NUMBER, TK.IDENTIFIER):
+                self._advance()  # Skip the address
+    
+    def _parse_field_bits(self) -> None:
+        """Skip optional @ [bits] syntax after a field name."""
+        if self._current_kind() == TK.AT:
+            self._advance()  # Skip @
+            if self._current_kind() == TK.LBRACKET:
+                self._advance()  # Skip [
+                # Skip until ]
+                while not self._is_at_end() and self._current_kind() != TK.RBRACKET:
+                    self._advance()
+                if self._current_kind() == TK.RBRACKET:
+                    self._advance()  # Skip ]
+    
+    # Block declarations keyed by the TK kind of their keyword:
+    # (symbol kind, detail, has_body, must_semi, suffix parser)
+    _DECL_TABLE = {
+        TK.BANK: (DMLSymbolKind.BANK, "bank", True, False, None),
+        TK.REGISTER: (DMLSymbolKind.REGISTER, "register", True, False, _parse_register_address),
+        TK.FIELD: (DMLSymbolKind.FIELD, "field", True, True, _parse_field_bits),
+        TK.METHOD: (DMLSymbolKind.METHOD, "method", True, False, None),
+        TK.PARAMETER: (DMLSymbolKind.PARAMETER, "parameter", False, True, None),
+        TK.ATTRIBUTE: (DMLSymbolKind.ATTRIBUTE, "attribute", False, True, None),
+    }
     
     def _current_token(self) -> Token:
         """Get the current token."""
-        if self.position >= len(self.tokens):
-            return self.tokens[-1]  # EOF token
-        return self.tokens[self.position]
+        return self._scanned.token(min(self.position, len(self._kinds) - 1))
+    
+    def _current_kind(self) -> int:
+        """Get the TK kind of the current token."""
+        return self._kinds[self.position]
     
-    def _previous_token(self) -> Token:
-        """Get the previous token."""
-        if self.position > 0 and self.position - 1 < len(self.tokens):
-            return self.tokens[self.position - 1]
-        return self.tokens[0] if self.tokens else self._current_token()
+    def _current_value(self) -> str:
+        """Get the text of the current token."""
+        return self._values[self.position]
     
     def _peek_token(self, offset: int = 1) -> Token:
         """Peek at a token ahead of current position."""
-        peek_pos = self.position + offset
-        if peek_pos >= len(self.tokens):
-            return self.tokens[-1]  # EOF token
-        return self.tokens[peek_pos]
+        return self._scanned.token(min(self.position + offset, len(self._kinds) - 1))
     
     def _current_token_span(self) -> ZeroSpan:
         """Get the span of the current token."""
         return self._current_token().span
     
-    def _advance(self) -> Token:
+    def _advance(self) -> None:
         """Advance to the next token."""
-        if not self._is_at_end():
+        # Never moves past the EOF token, so self.position always indexes
+        # the token arrays.
+        if self._kinds[self.position] != TK.EOF:
             self.position += 1
-        return self._current_token()
     
     def _is_at_end(self) -> bool:
         """Check if we're at the end of tokens."""
-        return (self.position >= len(self.tokens) or 
-                self._current_token().type == TokenType.EOF)
+        return self._kinds[self.position] == TK.EOF
     
-    def _check(self, *token_types: TokenType) -> bool:
-        """Check if current token matches any of the given types."""
+    def _check(self, *kinds: int) -> bool:
+        """Check if current token matches any of the given TK kinds."""
         if self._is_at_end():
             return False
-        return self._current_token().type in token_types
+        return self._current_kind() in kinds
     
-    def _match(self, *token_types: TokenType) -> bool:
-        """Check and consume if current token matches any of the given types."""
-        if self._check(*token_types):
+    def _match(self, *kinds: int) -> bool:
+        """Check and consume if current token matches any of the given TK kinds."""
+        if self._check(*kinds):
             self._advance()
             return True
         return False
     
-    def _expect(self, expected_type: TokenType) -> Token:
-        """Expect a specific token type."""
-        token = self._current_token()
-        if token.type == expected_type:
+    def _expect(self, expected_kind: int) -> None:
+        """Expect a token of the given TK kind."""
+        if self._kinds[self.position] == expected_kind:
             self._advance()
-            return token
         else:
-            error = DMLError(
-                kind=DMLErrorKind.SYNTAX_ERROR,
-                message=f"Expected {expected_type.value}, got {token.type.value}",
-                span=token.span
-            )
-            self.errors.append(error)
-            return token
+            self._expect_failed(expected_kind)
+    
+    def _expect_failed(self, expected_kind: int) -> None:
+        """Report that the current token is not of the expected TK kind."""
+        token = self._current_token()
+        error = DMLError(
+            kind=DMLErrorKind.SYNTAX_ERROR,
+            message=f"Expected {_TOKEN_TYPES[expected_kind].value}, got {token.type.value}",
+            span=token.span
+        )
+        self.errors.append(error)
     
     def extract_dml_version(self) -> Optional[str]:
         """Extract the DML version from parsing."""
@@ -884,5 +911,7 @@ __all__ = [
     "DMLLexer",
     "DMLParser", 
     "Token",
-    "TokenType"
+    "TokenArrays",
+    "TokenType",
+    "TK"
 ]
\ No newline at end of file
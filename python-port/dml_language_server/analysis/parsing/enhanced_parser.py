@@ -9,21 +9,35 @@ SPDX-License-Identifier: Apache-2.0 and MIT
 """
 
 import re
+import sys
 import logging
-from typing import List, Optional, Dict, Any, Union, Tuple, Set
-from enum import Enum
-from dataclasses import dataclass, field
+from array import array
+from typing import List, NamedTuple, Optional, Dict, Any, Union, Tuple, Set
+from enum import IntEnum
+from dataclasses import dataclass
 from abc import ABC, abstractmethod
 
-from ...span import ZeroSpan, ZeroPosition, ZeroRange, SpanBuilder
+from ...span import ZeroSpan, ZeroRange, SpanBuilder
 from ...lsp_data import DMLSymbol, DMLSymbolKind, DMLLocation
 from ..types import DMLError, DMLErrorKind, ReferenceKind, SymbolReference, NodeRef
 
 logger = logging.getLogger(__name__)
 
 
-class DMLTokenType(Enum):
-    """Enhanced DML token types covering full language grammar."""
+class DMLTokenType(IntEnum):
+    """Enhanced DML token types covering full language grammar.
+    
+    Members are numbered 0, 1, ... in definition order so a token stream
+    can hold them in a byte array; the spelling each one is declared with
+    is kept as its spelling attribute.
+    """
+    
+    def __new__(cls, spelling: str) -> 'DMLTokenType':
+        value = len(cls.__members__)
+        member = int.__new__(cls, value)
+        member._value_ = value
+        member.spelling = spelling
+        return member
     
     # Literals
     IDENTIFIER = "identifier"
@@ -225,14 +239,106 @@ class DMLTokenType(Enum):
     INVALID = "invalid"
 
 
-@dataclass
 class DMLToken:
-    """Enhanced token with additional metadata."""
-    type: DMLTokenType
-    value: str
-    span: ZeroSpan
-    leading_trivia: List[str] = field(default_factory=list)  # Comments, whitespace before token
-    trailing_trivia: List[str] = field(default_factory=list)  # Comments, whitespace after token
+    """Enhanced token with additional metadata.
+    
+    Tokens from the lexer record their start and end offsets and the span
+    builder of their source; the ZeroSpan is built on first access, which
+    the parser does only for tokens that begin or end a node. The trivia
+    lists are likewise created when first used.
+    """
+    
+    __slots__ = ('type', 'value', 'start', 'end', '_span', '_span_builder',
+                 '_leading_trivia', '_trailing_trivia')
+    
+    def __init__(self, type: DMLTokenType, value: str, span: Optional[ZeroSpan] = None,
+                 leading_trivia: Optional[List[str]] = None,
+                 trailing_trivia: Optional[List[str]] = None,
+                 span_builder: Optional[SpanBuilder] = None, start: int = 0, end: int = 0):
+        self.type = type
+        self.value = value
+        self.start = start
+        self.end = end
+        self._span = span
+        self._span_builder = span_builder
+        self._leading_trivia = leading_trivia
+        self._trailing_trivia = trailing_trivia
+    
+    @property
+    def span(self) -> ZeroSpan:
+        span = self._span
+        if span is None:
+            span = self._span = self._span_builder.span_from_offsets(self.start, self.end)
+        return span
+    
+    @property
+    def leading_trivia(self) -> List[str]:
+        """Comments, whitespace before token."""
+        if self._leading_trivia is None:
+            self._leading_trivia = []
+        return self._leading_trivia
+    
+    @leading_trivia.setter
+    def leading_trivia(self, trivia: List[str]) -> None:
+        self._leading_trivia = trivia
+    
+    @property
+    def trailing_trivia(self) -> List[str]:
+        """Comments, whitespace after token."""
+        if self._trailing_trivia is None:
+            self._trailing_trivia = []
+        return self._trailing_trivia
+    
+    @trailing_trivia.setter
+    def trailing_trivia(self, trivia: List[str]) -> None:
+        self._trailing_trivia = trivia
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DMLToken):
+            return NotImplemented
+        return ((self.type, self.value, self.span, self.leading_trivia, self.trailing_trivia) ==
+                (other.type, other.value, other.span, other.leading_trivia, other.trailing_trivia))
+    
+    __hash__ = None  # Mutable, like the dataclass it replaces
+    
+    def __repr__(self) -> str:
+        return (f"DMLToken(type={self.type!r}, value={self.value!r}, span={self.span!r}, "
+                f"leading_trivia={self.leading_trivia!r}, trailing_trivia={self.trailing_trivia!r})")
+
+
+_TOKEN_TYPES = tuple(DMLTokenType)
+
+
+class TokenStream(NamedTuple):
+    """A token stream stored as parallel arrays.
+    
+    Entry i of types, values, starts and ends describes token i; types
+    holds DMLTokenType values as bytes. The offsets are turned into a
+    span by span_builder only when asked, and no DMLToken exists until
+    token() builds one.
+    """
+    span_builder: SpanBuilder
+    types: array
+    values: List[str]
+    starts: array
+    ends: array
+    
+    def type_at(self, index: int) -> DMLTokenType:
+        """Type of token index."""
+        return _TOKEN_TYPES[self.types[index]]
+    
+    def value_at(self, index: int) -> str:
+        """Value of token index."""
+        return self.values[index]
+    
+    def span_at(self, index: int) -> ZeroSpan:
+        """Span of token index."""
+        return self.span_builder.span_from_offsets(self.starts[index], self.ends[index])
+    
+    def token(self, index: int) -> DMLToken:
+        """Materialize token index as a DMLToken."""
+        return DMLToken(_TOKEN_TYPES[self.types[index]], self.values[index], None, None, None,
+                        self.span_builder, self.starts[index], self.ends[index])
 
 
 class DMLLexer:
@@ -398,32 +504,200 @@ class DMLLexer:
         (':' , DMLTokenType.COLON),
     ]
     
+    PUNCTUATION = {
+        ';': DMLTokenType.SEMICOLON,
+        ',': DMLTokenType.COMMA,
+        '(': DMLTokenType.LEFT_PAREN,
+        ')': DMLTokenType.RIGHT_PAREN,
+        '{': DMLTokenType.LEFT_BRACE,
+        '}': DMLTokenType.RIGHT_BRACE,
+        '[': DMLTokenType.LEFT_BRACKET,
+        ']': DMLTokenType.RIGHT_BRACKET,
+        '#': DMLTokenType.HASH,
+        '$': DMLTokenType.DOLLAR,
+        '@': DMLTokenType.AT,
+    }
+    
+    HASH_DIRECTIVES = {
+        '#if': DMLTokenType.HASH_IF,
+        '#else': DMLTokenType.HASH_ELSE,
+        '#foreach': DMLTokenType.HASH_FOREACH,
+        '#select': DMLTokenType.HASH_SELECT,
+        '#?': DMLTokenType.HASH_COND_OP,
+        '#:': DMLTokenType.HASH_COLON,
+    }
+    
+    ESCAPES = {'n': '\n', 'r': '\r', 't': '\t', 'b': '\b', 'f': '\f', '\\': '\\', '"': '"', "'": "'"}
+    
+    _HASH_DIRECTIVE_RE = re.compile('|'.join(map(re.escape, HASH_DIRECTIVES)))
+    
+    # Operators and punctuation bucketed by first character, each bucket
+    # still longest first; no punctuation character starts an operator.
+    _SYMBOLS_BY_FIRST: Dict[str, List[Tuple[str, DMLTokenType]]] = {}
+    for _entry in [*OPERATORS, *PUNCTUATION.items()]:
+        _SYMBOLS_BY_FIRST.setdefault(_entry[0][0], []).append(_entry)
+    del _entry
+    
+    # Spelling -> (token type, shared value) for every keyword and every
+    # token whose text alone decides its type, so each occurrence reuses
+    # the one string held here instead of a fresh slice of the source.
+    _KEYWORD_TOKENS = {word: (token_type, word) for word, token_type in KEYWORDS.items()}
+    _FIXED_TOKENS = {
+        text: (token_type, text)
+        for text, token_type in [*OPERATORS, *PUNCTUATION.items(), *HASH_DIRECTIVES.items()]
+    }
+    
+    # One alternation over all token classes, tried in the same order as
+    # _next_token. It only accepts well-formed ASCII input; unterminated
+    # literals and comments are left to the character reader, which keeps
+    # its quirks in one place.
+    _TOKEN_RE = re.compile(r"""
+        (?P<whitespace>\s+)
+      | (?P<line_comment>//[^\n]*)
+      | (?P<block_comment>/\*(?:.*?\*/)?)
+      | (?P<cblock>%\{(?:.*?%\})?)
+      | (?P<string>"(?:[^"\\]|\\.)*")
+      | (?P<character>'(?:[^'\\]|\\.)*')
+      | (?P<number>0[xX][0-9a-fA-F]*[uUlLfF]*
+                 | (?:[0-9]|\.[0-9])[0-9.]*(?:[eE][+-]?[0-9]*)?[uUlLfF]*)
+      | (?P<identifier>[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<fixed>""" + '|'.join(re.escape(text) for text in [*HASH_DIRECTIVES, *dict(OPERATORS), *PUNCTUATION]) + """)
+    """, re.VERBOSE | re.DOTALL)
+    _ESCAPE_RE = re.compile(r'\\(.)', re.DOTALL)
+    
+    # Character-reader patterns; unlike _TOKEN_RE these accept unterminated
+    # literals and non-ASCII names.
+    _QUOTED_RES = {
+        '"': re.compile(r'"((?:[^"\\]|\\.|\\\Z)*)"?', re.DOTALL),
+        "'": re.compile(r"'((?:[^'\\]|\\.|\\\Z)*)'?", re.DOTALL),
+    }
+    _NAME_RE = re.compile(r'\w+')
+    _WHITESPACE_RE = re.compile(r'\s+')
+    
     def __init__(self, content: str, file_path: str):
         self.content = content
         self.file_path = file_path
         self.position = 0
-        self.line = 0
-        self.column = 0
+        self.span_builder = SpanBuilder(file_path)
+        self.span_builder.set_content(content)
         self.tokens: List[DMLToken] = []
     
+    @property
+    def line(self) -> int:
+        """Zero-based line of the current position."""
+        return self.span_builder.position_from_offset(self.position).line
+    
+    @property
+    def column(self) -> int:
+        """Zero-based column of the current position."""
+        return self.span_builder.position_from_offset(self.position).column
+    
+    def _token(self, token_type: DMLTokenType, value: str, start: int) -> DMLToken:
+        """Token from a start offset to the current position."""
+        return DMLToken(token_type, value, None, None, None, self.span_builder, start, self.position)
+    
     def tokenize(self) -> List[DMLToken]:
         """Tokenize the input content."""
-        while self.position < len(self.content):
-            self._skip_whitespace_and_comments()
+        stream = self.scan()
+        self.tokens.extend(map(stream.token, range(len(stream.types))))
+        return self.tokens
+    
+    def scan(self) -> TokenStream:
+        """Tokenize the input content into parallel arrays."""
+        types = array('B')
+        values: List[str] = []
+        starts = array('i')
+        ends = array('i')
+        add_type = types.append
+        add_value = values.append
+        add_start = starts.append
+        add_end = ends.append
+        content = self.content
+        length = len(content)
+        match = self._TOKEN_RE.match
+        keywords = self._KEYWORD_TOKENS
+        fixed = self._FIXED_TOKENS
+        intern = sys.intern
+        identifier = DMLTokenType.IDENTIFIER
+        
+        # The scan position lives in a local and is written back to the
+        # instance only around calls into the character reader. Line and
+        # column are never tracked; spans are built from the offsets when
+        # asked.
+        pos = self.position
+        
+        while pos < length:
+            m = match(content, pos)
+            if m is not None:
+                kind = m.lastgroup
+                end = m.end()
+                if end < length and content[end] > '\x7f':
+                    # The reader continues names and numbers into non-ASCII
+                    # letters and digits; let it decide where this one ends.
+                    m = None
+                elif (kind == 'block_comment' or kind == 'cblock') and end - pos < 4:
+                    # Unterminated
+                    m = None
             
-            if self.position >= len(self.content):
-                break
-                
-            token = self._next_token()
-            if token:
-                self.tokens.append(token)
+            if m is None:
+                self.position = pos
+                self._skip_whitespace_and_comments()
+                if self.position < length:
+                    token = self._next_token()
+                    if token:
+                        add_type(token.type)
+                        add_value(token.value)
+                        add_start(token.start)
+                        add_end(token.end)
+                pos = self.position
+                continue
+            
+            if kind == 'whitespace' or kind == 'line_comment' or kind == 'block_comment':
+                pos = end
+                continue
+            
+            value = m.group()
+            if kind == 'identifier':
+                keyword = keywords.get(value)
+                if keyword is None:
+                    token_type = identifier
+                    value = intern(value)
+                else:
+                    token_type, value = keyword
+            elif kind == 'fixed':
+                token_type, value = fixed[value]
+            elif kind == 'number':
+                token_type = DMLTokenType.NUMBER
+            elif kind == 'cblock':
+                token_type = DMLTokenType.CBLOCK
+                value = value[2:-2]
+            else:
+                token_type = DMLTokenType.STRING if kind == 'string' else DMLTokenType.CHARACTER
+                value = value[1:-1]
+                if '\\' in value:
+                    value = self._ESCAPE_RE.sub(self._unescape, value)
+            
+            add_type(token_type)
+            add_value(value)
+            add_start(pos)
+            add_end(end)
+            pos = end
+        
+        self.position = pos
         
         # Add EOF token
-        eof_pos = ZeroPosition(self.line, self.column)
-        eof_span = ZeroSpan(self.file_path, ZeroRange(eof_pos, eof_pos))
-        self.tokens.append(DMLToken(DMLTokenType.EOF, "", eof_span))
+        add_type(DMLTokenType.EOF)
+        add_value("")
+        add_start(pos)
+        add_end(pos)
         
-        return self.tokens
+        return TokenStream(self.span_builder, types, values, starts, ends)
+    
+    @classmethod
+    def _unescape(cls, m: 're.Match[str]') -> str:
+        """Expand one backslash escape the way the character reader does."""
+        char = m.group(1)
+        return cls.ESCAPES.get(char, char)
     
     def _skip_whitespace_and_comments(self) -> None:
         """Skip whitespace and comments."""
@@ -431,12 +705,7 @@ class DMLLexer:
             char = self.content[self.position]
             
             if char.isspace():
-                if char == '\n':
-                    self.line += 1
-                    self.column = 0
-                else:
-                    self.column += 1
-                self.position += 1
+                self.position = self._WHITESPACE_RE.match(self.content, self.position).end()
             elif char == '/' and self.position + 1 < len(self.content):
                 next_char = self.content[self.position + 1]
                 if next_char == '/':
@@ -452,292 +721,152 @@ class DMLLexer:
     
     def _skip_line_comment(self) -> None:
         """Skip single-line comment."""
-        while self.position < len(self.content) and self.content[self.position] != '\n':
-            self.position += 1
-            self.column += 1
+        end = self.content.find('\n', self.position)
+        self.position = len(self.content) if end < 0 else end
     
     def _skip_block_comment(self) -> None:
         """Skip block comment."""
-        self.position += 2  # Skip /*
-        self.column += 2
-        
-        while self.position + 1 < len(self.content):
-            if self.content[self.position] == '*' and self.content[self.position + 1] == '/':
-                self.position += 2
-                self.column += 2
-                break
-            elif self.content[self.position] == '\n':
-                self.line += 1
-                self.column = 0
-                self.position += 1
-            else:
-                self.position += 1
-                self.column += 1
+        end = self.content.find('*/', self.position + 2)
+        # An unterminated comment stops short of the final character
+        self.position = max(self.position + 2, len(self.content) - 1) if end < 0 else end + 2
     
     def _next_token(self) -> Optional[DMLToken]:
         """Get the next token."""
         if self.position >= len(self.content):
             return None
         
-        start_pos = ZeroPosition(self.line, self.column)
+        start = self.position
         char = self.content[self.position]
         
         # Hash directives
         if char == '#':
-            if self.content[self.position:].startswith('#if'):
-                return self._read_hash_directive(start_pos, '#if', DMLTokenType.HASH_IF)
-            elif self.content[self.position:].startswith('#else'):
-                return self._read_hash_directive(start_pos, '#else', DMLTokenType.HASH_ELSE)
-            elif self.content[self.position:].startswith('#foreach'):
-                return self._read_hash_directive(start_pos, '#foreach', DMLTokenType.HASH_FOREACH)
-            elif self.content[self.position:].startswith('#select'):
-                return self._read_hash_directive(start_pos, '#select', DMLTokenType.HASH_SELECT)
-            elif self.content[self.position:].startswith('#?'):
-                return self._read_hash_directive(start_pos, '#?', DMLTokenType.HASH_COND_OP)
-            elif self.content[self.position:].startswith('#:'):
-                return self._read_hash_directive(start_pos, '#:', DMLTokenType.HASH_COLON)
+            m = self._HASH_DIRECTIVE_RE.match(self.content, self.position)
+            if m is not None:
+                directive = m.group()
+                return self._read_hash_directive(start, directive, self.HASH_DIRECTIVES[directive])
         
         # C-blocks
         if char == '%' and self.position + 1 < len(self.content) and self.content[self.position + 1] == '{':
-            return self._read_cblock(start_pos)
+            return self._read_cblock(start)
         
         # String literals
         if char == '"':
-            return self._read_string_literal(start_pos)
+            return self._read_string_literal(start)
         
         # Character literals  
         if char == "'":
-            return self._read_character_literal(start_pos)
+            return self._read_character_literal(start)
         
         # Numbers
         if char.isdigit() or (char == '.' and self.position + 1 < len(self.content) and self.content[self.position + 1].isdigit()):
-            return self._read_number(start_pos)
+            return self._read_number(start)
         
         # Identifiers and keywords
         if char.isalpha() or char == '_':
-            return self._read_identifier(start_pos)
-        
-        # Operators
-        for op_str, op_type in self.OPERATORS:
-            if self.content[self.position:].startswith(op_str):
-                self.position += len(op_str)
-                self.column += len(op_str)
-                end_pos = ZeroPosition(self.line, self.column)
-                span = ZeroSpan(self.file_path, ZeroRange(start_pos, end_pos))
-                return DMLToken(op_type, op_str, span)
-        
-        # Punctuation
-        punctuation_map = {
-            ';': DMLTokenType.SEMICOLON,
-            ',': DMLTokenType.COMMA,
-            '(': DMLTokenType.LEFT_PAREN,
-            ')': DMLTokenType.RIGHT_PAREN,
-            '{': DMLTokenType.LEFT_BRACE,
-            '}': DMLTokenType.RIGHT_BRACE,
-            '[': DMLTokenType.LEFT_BRACKET,
-            ']': DMLTokenType.RIGHT_BRACKET,
-            '#': DMLTokenType.HASH,
-            '$': DMLTokenType.DOLLAR,
-            '@': DMLTokenType.AT,
-        }
+            return self._read_identifier(start)
         
-        if char in punctuation_map:
-            self.position += 1
-            self.column += 1
-            end_pos = ZeroPosition(self.line, self.column)
-            span = ZeroSpan(self.file_path, ZeroRange(start_pos, end_pos))
-            return DMLToken(punctuation_map[char], char, span)
+        # Operators and punctuation
+        for symbol, symbol_type in self._SYMBOLS_BY_FIRST.get(char, ()):
+            if self.content.startswith(symbol, self.position):
+                self.position += len(symbol)
+                return self._token(symbol_type, symbol, start)
         
         # Invalid character
         self.position += 1
-        self.column += 1
-        end_pos = ZeroPosition(self.line, self.column)
-        span = ZeroSpan(self.file_path, ZeroRange(start_pos, end_pos))
-        return DMLToken(DMLTokenType.INVALID, char, span)
+        return self._token(DMLTokenType.INVALID, char, start)
     
-    def _read_string_literal(self, start_pos: ZeroPosition) -> DMLToken:
+    def _read_string_literal(self, start: int) -> DMLToken:
         """Read a string literal."""
-        value = ""
-        self.position += 1  # Skip opening quote
-        self.column += 1
-        
-        while self.position < len(self.content):
-            char = self.content[self.position]
-            
-            if char == '"':
-                self.position += 1
-                self.column += 1
-                break
-            elif char == '\\' and self.position + 1 < len(self.content):
-                # Escape sequence
-                self.position += 1
-                self.column += 1
-                next_char = self.content[self.position]
-                if next_char in 'nrtbf\\"\'':
-                    escape_map = {'n': '\n', 'r': '\r', 't': '\t', 'b': '\b', 'f': '\f', '\\': '\\', '"': '"', "'": "'"}
-                    value += escape_map.get(next_char, next_char)
-                else:
-                    value += next_char
-                self.position += 1
-                self.column += 1
-            else:
-                if char == '\n':
-                    self.line += 1
-                    self.column = 0
-                else:
-                    self.column += 1
-                value += char
-                self.position += 1
-        
-        end_pos = ZeroPosition(self.line, self.column)
-        span = ZeroSpan(self.file_path, ZeroRange(start_pos, end_pos))
-        return DMLToken(DMLTokenType.STRING, value, span)
+        return self._read_quoted(start, '"', DMLTokenType.STRING)
     
-    def _read_character_literal(self, start_pos: ZeroPosition) -> DMLToken:
+    def _read_character_literal(self, start: int) -> DMLToken:
         """Read a character literal."""
-        value = ""
-        self.position += 1  # Skip opening quote
-        self.column += 1
-        
-        while self.position < len(self.content):
-            char = self.content[self.position]
-            
-            if char == "'":
-                self.position += 1
-                self.column += 1
-                break
-            elif char == '\\' and self.position + 1 < len(self.content):
-                # Escape sequence
-                self.position += 1
-                self.column += 1
-                next_char = self.content[self.position]
-                if next_char in 'nrtbf\\"\'':
-                    escape_map = {'n': '\n', 'r': '\r', 't': '\t', 'b': '\b', 'f': '\f', '\\': '\\', '"': '"', "'": "'"}
-                    value += escape_map.get(next_char, next_char)
-                else:
-                    value += next_char
-                self.position += 1
-                self.column += 1
-            else:
-                value += char
-                self.position += 1
-                self.column += 1
+        return self._read_quoted(start, "'", DMLTokenType.CHARACTER)
+    
+    def _read_quoted(self, start: int, quote: str, token_type: DMLTokenType) -> DMLToken:
+        """Read a quoted literal, expanding escapes, up to its closing quote."""
+        m = self._QUOTED_RES[quote].match(self.content, start)
+        value = m.group(1)
+        if '\\' in value:
+            value = self._ESCAPE_RE.sub(self._unescape, value)
         
-        end_pos = ZeroPosition(self.line, self.column)
-        span = ZeroSpan(self.file_path, ZeroRange(start_pos, end_pos))
-        return DMLToken(DMLTokenType.CHARACTER, value, span)
+        self.position = m.end()
+        return self._token(token_type, value, start)
     
-    def _read_number(self, start_pos: ZeroPosition) -> DMLToken:
+    def _read_number(self, start: int) -> DMLToken:
         """Read a numeric literal."""
-        value = ""
+        content = self.content
+        length = len(content)
+        pos = start
         
         # Handle hex numbers
-        if (self.content[self.position] == '0' and 
-            self.position + 1 < len(self.content) and 
-            self.content[self.position + 1].lower() == 'x'):
-            value += self.content[self.position:self.position + 2]
-            self.position += 2
-            self.column += 2
+        if (content[pos] == '0' and 
+            pos + 1 < length and 
+            content[pos + 1].lower() == 'x'):
+            pos += 2
             
-            while (self.position < len(self.content) and 
-                   (self.content[self.position].isdigit() or 
-                    self.content[self.position].lower() in 'abcdef')):
-                value += self.content[self.position]
-                self.position += 1
-                self.column += 1
+            while (pos < length and 
+                   (content[pos].isdigit() or 
+                    content[pos].lower() in 'abcdef')):
+                pos += 1
         else:
             # Decimal number
-            while (self.position < len(self.content) and 
-                   (self.content[self.position].isdigit() or self.content[self.position] == '.')):
-                value += self.content[self.position]
-                self.position += 1
-                self.column += 1
+            while (pos < length and 
+                   (content[pos].isdigit() or content[pos] == '.')):
+                pos += 1
             
             # Scientific notation
-            if (self.position < len(self.content) and 
-                self.content[self.position].lower() == 'e'):
-                value += self.content[self.position]
-                self.position += 1
-                self.column += 1
+            if pos < length and content[pos].lower() == 'e':
+                pos += 1
                 
-                if (self.position < len(self.content) and 
-                    self.content[self.position] in '+-'):
-                    value += self.content[self.position]
-                    self.position += 1
-                    self.column += 1
+                if pos < length and content[pos] in '+-':
+                    pos += 1
                 
-                while (self.position < len(self.content) and 
-                       self.content[self.position].isdigit()):
-                    value += self.content[self.position]
-                    self.position += 1
-                    self.column += 1
+                while pos < length and content[pos].isdigit():
+                    pos += 1
         
         # Suffixes (u, l, f, etc.)
-        while (self.position < len(self.content) and 
-               self.content[self.position].lower() in 'ulf'):
-            value += self.content[self.position]
-            self.position += 1
-            self.column += 1
+        while pos < length and content[pos].lower() in 'ulf':
+            pos += 1
         
-        end_pos = ZeroPosition(self.line, self.column)
-        span = ZeroSpan(self.file_path, ZeroRange(start_pos, end_pos))
-        return DMLToken(DMLTokenType.NUMBER, value, span)
+        self.position = pos
+        return self._token(DMLTokenType.NUMBER, content[start:pos], start)
     
-    def _read_identifier(self, start_pos: ZeroPosition) -> DMLToken:
+    def _read_identifier(self, start: int) -> DMLToken:
         """Read an identifier or keyword."""
-        value = ""
-        
-        while (self.position < len(self.content) and 
-               (self.content[self.position].isalnum() or self.content[self.position] == '_')):
-            value += self.content[self.position]
-            self.position += 1
-            self.column += 1
-        
-        end_pos = ZeroPosition(self.line, self.column)
-        span = ZeroSpan(self.file_path, ZeroRange(start_pos, end_pos))
+        value = self._NAME_RE.match(self.content, start).group()
+        self.position = start + len(value)
         
         # Check if it's a keyword
-        token_type = self.KEYWORDS.get(value, DMLTokenType.IDENTIFIER)
-        return DMLToken(token_type, value, span)
+        keyword = self._KEYWORD_TOKENS.get(value)
+        if keyword is None:
+            return self._token(DMLTokenType.IDENTIFIER, sys.intern(value), start)
+        token_type, value = keyword
+        return self._token(token_type, value, start)
     
-    def _read_hash_directive(self, start_pos: ZeroPosition, directive: str, token_type: DMLTokenType) -> DMLToken:
+    def _read_hash_directive(self, start: int, directive: str, token_type: DMLTokenType) -> DMLToken:
         """Read a hash directive."""
         self.position += len(directive)
-        self.column += len(directive)
-        end_pos = ZeroPosition(self.line, self.column)
-        span = ZeroSpan(self.file_path, ZeroRange(start_pos, end_pos))
-        return DMLToken(token_type, directive, span)
+        return self._token(token_type, directive, start)
     
-    def _read_cblock(self, start_pos: ZeroPosition) -> DMLToken:
+    def _read_cblock(self, start: int) -> DMLToken:
         """Read a C-block %{...%}."""
-        value = ""
-        self.position += 2  # Skip %{
-        self.column += 2
-        
-        while self.position + 1 < len(self.content):
-            if self.content[self.position] == '%' and self.content[self.position + 1] == '}':
-                self.position += 2
-                self.column += 2
-                break
-            elif self.content[self.position] == '\n':
-                self.line += 1
-                self.column = 0
-                value += self.content[self.position]
-                self.position += 1
-            else:
-                value += self.content[self.position]
-                self.position += 1
-                self.column += 1
-        
-        end_pos = ZeroPosition(self.line, self.column)
-        span = ZeroSpan(self.file_path, ZeroRange(start_pos, end_pos))
-        return DMLToken(DMLTokenType.CBLOCK, value, span)
+        end = self.content.find('%}', start + 2)
+        if end < 0:
+            # An unterminated block stops short of the final character
+            end = max(start + 2, len(self.content) - 1)
+            self.position = end
+        else:
+            self.position = end + 2
+        return self._token(DMLTokenType.CBLOCK, self.content[start + 2:end], start)
 
 
 # AST Node Types
 class ASTNode(ABC):
     """Base class for all AST nodes."""
     
+    __slots__ = ('span',)
+    
     def __init__(self, span: ZeroSpan):
         self.span = span
     
@@ -750,6 +879,8 @@ class ASTNode(ABC):
 class DMLExpression(ASTNode):
     """Base class for all DML expressions."""
     
+    __slots__ = ()
+    
     def __init__(self, span: ZeroSpan):
         super().__init__(span)
 
@@ -757,6 +888,8 @@ class DMLExpression(ASTNode):
 class DMLStatement(ASTNode):
     """Base class for all DML statements."""
     
+    __slots__ = ()
+    
     def __init__(self, span: ZeroSpan):
         super().__init__(span)
 
@@ -764,6 +897,8 @@ class DMLStatement(ASTNode):
 class DMLDeclaration(ASTNode):
     """Base class for all DML declarations."""
     
+    __slots__ = ('name',)
+    
     def __init__(self, span: ZeroSpan, name: str):
         super().__init__(span)
         self.name = name
@@ -776,6 +911,8 @@ class DMLDeclaration(ASTNode):
 class IdentifierExpression(DMLExpression):
     """Identifier expression."""
     
+    __slots__ = ('name',)
+    
     def __init__(self, span: ZeroSpan, name: str):
         super().__init__(span)
         self.name = name
@@ -787,6 +924,8 @@ class IdentifierExpression(DMLExpression):
 class LiteralExpression(DMLExpression):
     """Literal expression."""
     
+    __slots__ = ('value', 'literal_type')
+    
     def __init__(self, span: ZeroSpan, value: Any, literal_type: str):
         super().__init__(span)
         self.value = value
@@ -804,9 +943,6 @@ class BinaryExpression(DMLExpression):
     operator: DMLToken
     right: DMLExpression
     
-    def __post_init__(self):
-        super().__init__(self.span)
-    
     def accept(self, visitor):
         return visitor.visit_binary(self)
 
@@ -818,9 +954,6 @@ class UnaryExpression(DMLExpression):
     operator: DMLToken
     operand: DMLExpression
     
-    def __post_init__(self):
-        super().__init__(self.span)
-    
     def accept(self, visitor):
         return visitor.visit_unary(self)
 
@@ -832,9 +965,6 @@ class CallExpression(DMLExpression):
     callee: DMLExpression
     arguments: List[DMLExpression]
     
-    def __post_init__(self):
-        super().__init__(self.span)
-    
     def accept(self, visitor):
         return visitor.visit_call(self)
 
@@ -846,9 +976,6 @@ class MemberExpression(DMLExpression):
     object: DMLExpression
     member: str
     
-    def __post_init__(self):
-        super().__init__(self.span)
-    
     def accept(self, visitor):
         return visitor.visit_member(self)
 
@@ -860,9 +987,6 @@ class IndexExpression(DMLExpression):
     object: DMLExpression
     index: DMLExpression
     
-    def __post_init__(self):
-        super().__init__(self.span)
-    
     def accept(self, visitor):
         return visitor.visit_index(self)
 
@@ -875,9 +999,6 @@ class TertiaryExpression(DMLExpression):
     true_expr: DMLExpression
     false_expr: DMLExpression
     
-    def __post_init__(self):
-        super().__init__(self.span)
-    
     def accept(self, visitor):
         return visitor.visit_tertiary(self)
 
@@ -889,9 +1010,6 @@ class ExpressionStatement(DMLStatement):
     span: ZeroSpan
     expression: DMLExpression
     
-    def __post_init__(self):
-        super().__init__(self.span)
-    
     def accept(self, visitor):
         return visitor.visit_expression_statement(self)
 
@@ -899,6 +1017,8 @@ class ExpressionStatement(DMLStatement):
 class BlockStatement(DMLStatement):
     """Block statement."""
     
+    __slots__ = ('statements',)
+    
     def __init__(self, span: ZeroSpan, statements: List[DMLStatement]):
         super().__init__(span)
         self.statements = statements
@@ -915,9 +1035,6 @@ class IfStatement(DMLStatement):
     then_statement: DMLStatement
     else_statement: Optional[DMLStatement] = None
     
-    def __post_init__(self):
-        super().__init__(self.span)
-    
     def accept(self, visitor):
         return visitor.visit_if(self)
 
@@ -929,9 +1046,6 @@ class WhileStatement(DMLStatement):
     condition: DMLExpression
     body: DMLStatement
     
-    def __post_init__(self):
-        super().__init__(self.span)
-    
     def accept(self, visitor):
         return visitor.visit_while(self)
 
@@ -945,9 +1059,6 @@ class ForStatement(DMLStatement):
     increment: Optional[DMLExpression]
     body: DMLStatement
     
-    def __post_init__(self):
-        super().__init__(self.span)
-    
     def accept(self, visitor):
         return visitor.visit_for(self)
 
@@ -958,9 +1069,6 @@ class ReturnStatement(DMLStatement):
     span: ZeroSpan
     value: Optional[DMLExpression] = None
     
-    def __post_init__(self):
-        super().__init__(self.span)
-    
     def accept(self, visitor):
         return visitor.visit_return(self)
 
@@ -969,6 +1077,8 @@ class ReturnStatement(DMLStatement):
 class ParameterDeclaration(DMLDeclaration):
     """Parameter declaration."""
     
+    __slots__ = ('parameter_type', 'default_value')
+    
     def __init__(self, span: ZeroSpan, name: str, parameter_type: Optional[str] = None, default_value: Optional[DMLExpression] = None):
         super().__init__(span, name)
         self.parameter_type = parameter_type
@@ -981,6 +1091,8 @@ class ParameterDeclaration(DMLDeclaration):
 class MethodDeclaration(DMLDeclaration):
     """Method declaration."""
     
+    __slots__ = ('parameters', 'return_type', 'body', 'modifier', 'independent', 'startup', 'memoized', 'throws', 'default')
+    
     def __init__(self, span: ZeroSpan, name: str, parameters: List['VariableDeclaration'], 
                  return_type: Optional[str] = None, body: Optional[BlockStatement] = None,
                  modifier: Optional[str] = None, independent: bool = False, 
@@ -1004,6 +1116,8 @@ class MethodDeclaration(DMLDeclaration):
 class VariableDeclaration(DMLDeclaration):
     """Variable declaration."""
     
+    __slots__ = ('variable_type', 'initializer')
+    
     def __init__(self, span: ZeroSpan, name: str, variable_type: str, initializer: Optional[DMLExpression] = None):
         super().__init__(span, name)
         self.variable_type = variable_type
@@ -1013,9 +1127,24 @@ class VariableDeclaration(DMLDeclaration):
         return visitor.visit_variable(self)
 
 
+class ConstantDeclaration(DMLDeclaration):
+    """Constant declaration."""
+    
+    __slots__ = ('value',)
+    
+    def __init__(self, span: ZeroSpan, name: str, value: str):
+        super().__init__(span, name)
+        self.value = value
+    
+    def accept(self, visitor):
+        return visitor.visit_constant(self)
+
+
 class FieldDeclaration(DMLDeclaration):
     """Field declaration."""
     
+    __slots__ = ('size', 'parameters', 'methods')
+    
     def __init__(self, span: ZeroSpan, name: str, size: Optional[DMLExpression] = None, parameters: List[ParameterDeclaration] = None, methods: List[MethodDeclaration] = None):
         super().__init__(span, name)
         self.size = size
@@ -1029,6 +1158,8 @@ class FieldDeclaration(DMLDeclaration):
 class RegisterDeclaration(DMLDeclaration):
     """Register declaration."""
     
+    __slots__ = ('size', 'offset', 'parameters', 'fields', 'methods')
+    
     def __init__(self, span: ZeroSpan, name: str, size: Optional[DMLExpression] = None, offset: Optional[DMLExpression] = None, parameters: List[ParameterDeclaration] = None, fields: List[FieldDeclaration] = None, methods: List[MethodDeclaration] = None):
         super().__init__(span, name)
         self.size = size
@@ -1044,6 +1175,8 @@ class RegisterDeclaration(DMLDeclaration):
 class BankDeclaration(DMLDeclaration):
     """Bank declaration."""
     
+    __slots__ = ('parameters', 'registers', 'methods')
+    
     def __init__(self, span: ZeroSpan, name: str, parameters: List[ParameterDeclaration] = None, registers: List[RegisterDeclaration] = None, methods: List[MethodDeclaration] = None):
         super().__init__(span, name)
         self.parameters = parameters or []
@@ -1057,6 +1190,8 @@ class BankDeclaration(DMLDeclaration):
 class TemplateDeclaration(DMLDeclaration):
     """Template declaration."""
     
+    __slots__ = ('parameters', 'methods', 'fields', 'registers', 'banks')
+    
     def __init__(self, span: ZeroSpan, name: str, parameters: List[ParameterDeclaration] = None, methods: List[MethodDeclaration] = None, fields: List[FieldDeclaration] = None, registers: List[RegisterDeclaration] = None, banks: List[BankDeclaration] = None):
         super().__init__(span, name)
         self.parameters = parameters or []
@@ -1072,6 +1207,8 @@ class TemplateDeclaration(DMLDeclaration):
 class DeviceDeclaration(DMLDeclaration):
     """Device declaration."""
     
+    __slots__ = ('parameters', 'banks', 'methods', 'templates')
+    
     def __init__(self, span: ZeroSpan, name: str, parameters: List[ParameterDeclaration] = None, banks: List[BankDeclaration] = None, methods: List[MethodDeclaration] = None, templates: List[str] = None):
         super().__init__(span, name)
         self.parameters = parameters or []
@@ -1086,6 +1223,8 @@ class DeviceDeclaration(DMLDeclaration):
 class ImportDeclaration(DMLDeclaration):
     """Import declaration."""
     
+    __slots__ = ('module_name',)
+    
     def __init__(self, span: ZeroSpan, module_name: str):
         super().__init__(span, "import")
         self.module_name = module_name
@@ -1097,6 +1236,8 @@ class ImportDeclaration(DMLDeclaration):
 class DMLVersionDeclaration(DMLDeclaration):
     """DML version declaration."""
     
+    __slots__ = ('version',)
+    
     def __init__(self, span: ZeroSpan, version: str):
         super().__init__(span, "dml")
         self.version = version
@@ -1108,6 +1249,8 @@ class DMLVersionDeclaration(DMLDeclaration):
 class ConnectDeclaration(DMLDeclaration):
     """Connect declaration."""
     
+    __slots__ = ('parameters',)
+    
     def __init__(self, span: ZeroSpan, name: str, parameters: List[ParameterDeclaration] = None):
         super().__init__(span, name)
         self.parameters = parameters or []
@@ -1119,6 +1262,8 @@ class ConnectDeclaration(DMLDeclaration):
 class InterfaceDeclaration(DMLDeclaration):
     """Interface declaration."""
     
+    __slots__ = ('parameters',)
+    
     def __init__(self, span: ZeroSpan, name: str, parameters: List[ParameterDeclaration] = None):
         super().__init__(span, name)
         self.parameters = parameters or []
@@ -1130,6 +1275,8 @@ class InterfaceDeclaration(DMLDeclaration):
 class PortDeclaration(DMLDeclaration):
     """Port declaration."""
     
+    __slots__ = ('parameters',)
+    
     def __init__(self, span: ZeroSpan, name: str, parameters: List[ParameterDeclaration] = None):
         super().__init__(span, name)
         self.parameters = parameters or []
@@ -1141,6 +1288,8 @@ class PortDeclaration(DMLDeclaration):
 class AttributeDeclaration(DMLDeclaration):
     """Attribute declaration."""
     
+    __slots__ = ('parameters',)
+    
     def __init__(self, span: ZeroSpan, name: str, parameters: List[ParameterDeclaration] = None):
         super().__init__(span, name)
         self.parameters = parameters or []
@@ -1152,6 +1301,8 @@ class AttributeDeclaration(DMLDeclaration):
 class EventDeclaration(DMLDeclaration):
     """Event declaration."""
     
+    __slots__ = ('parameters',)
+    
     def __init__(self, span: ZeroSpan, name: str, parameters: List[ParameterDeclaration] = None):
         super().__init__(span, name)
         self.parameters = parameters or []
@@ -1163,6 +1314,8 @@ class EventDeclaration(DMLDeclaration):
 class GroupDeclaration(DMLDeclaration):
     """Group declaration."""
     
+    __slots__ = ('parameters',)
+    
     def __init__(self, span: ZeroSpan, name: str, parameters: List[ParameterDeclaration] = None):
         super().__init__(span, name)
         self.parameters = parameters or []
@@ -1174,11 +1327,23 @@ class GroupDeclaration(DMLDeclaration):
 class EnhancedDMLParser:
     """Enhanced DML parser with comprehensive grammar support."""
     
+    # Declaration keywords that _synchronize resumes at, flagged by token type
+    _RECOVERY_ANCHORS = bytes(
+        token_type in (
+            DMLTokenType.DEVICE, DMLTokenType.TEMPLATE, DMLTokenType.BANK,
+            DMLTokenType.REGISTER, DMLTokenType.FIELD, DMLTokenType.METHOD,
+            DMLTokenType.PARAMETER, DMLTokenType.IMPORT, DMLTokenType.DML,
+        )
+        for token_type in _TOKEN_TYPES
+    )
+    
     def __init__(self, content: str, file_path: str):
         self.content = content
         self.file_path = file_path
         self.lexer = DMLLexer(content, file_path)
-        self.tokens = self.lexer.tokenize()
+        self.stream = self.lexer.scan()
+        self._types = self.stream.types
+        self._tokens: List[Optional[DMLToken]] = [None] * len(self._types)
         self.position = 0
         self.errors: List[DMLError] = []
         self.symbols: List[DMLSymbol] = []
@@ -1190,6 +1355,22 @@ class EnhancedDMLParser:
         # Recovery state
         self._in_recovery = False
         self._recovery_tokens = {DMLTokenType.SEMICOLON, DMLTokenType.RIGHT_BRACE}
+        
+        # Top-level declaration parsers keyed by the type of their keyword
+        self._top_dispatch = {
+            DMLTokenType.DML: self._parse_dml_version,
+            DMLTokenType.IMPORT: self._parse_import,
+            DMLTokenType.DEVICE: self._parse_device,
+            DMLTokenType.TEMPLATE: self._parse_template,
+            DMLTokenType.TYPEDEF: self._parse_typedef,
+            DMLTokenType.PARAMETER: self._parse_parameter,
+            DMLTokenType.CONNECT: self._parse_connect,
+            DMLTokenType.BANK: self._parse_bank,
+            DMLTokenType.ATTRIBUTE: self._parse_attribute,
+            DMLTokenType.EVENT: self._parse_event,
+            DMLTokenType.GROUP: self._parse_group,
+            DMLTokenType.CONSTANT: self._parse_constant,
+        }
     
     def parse(self) -> List[DMLDeclaration]:
         """Parse the token stream and return AST."""
@@ -1218,19 +1399,36 @@ class EnhancedDMLParser:
         """Get symbol references."""
         return self.references
     
+    @property
+    def tokens(self) -> List[DMLToken]:
+        """All tokens, materialized."""
+        return [self._token_at(index) for index in range(len(self._types))]
+    
     # Token management
+    def _token_at(self, index: int) -> DMLToken:
+        """Materialize the token at index, at most once."""
+        token = self._tokens[index]
+        if token is None:
+            token = self._tokens[index] = self.stream.token(index)
+        return token
+    
     def _current_token(self) -> DMLToken:
         """Get current token."""
-        if self.position >= len(self.tokens):
-            return self.tokens[-1]  # EOF token
-        return self.tokens[self.position]
+        if self.position >= len(self._types):
+            return self._token_at(-1)  # EOF token
+        return self._token_at(self.position)
     
     def _peek_token(self, offset: int = 1) -> DMLToken:
         """Peek at token ahead."""
         pos = self.position + offset
-        if pos >= len(self.tokens):
-            return self.tokens[-1]  # EOF token
-        return self.tokens[pos]
+        if pos >= len(self._types):
+            return self._token_at(-1)  # EOF token
+        return self._token_at(pos)
+    
+    def _span_between(self, first: int, last: int) -> ZeroSpan:
+        """Span from the start of token first to the end of token last."""
+        stream = self.stream
+        return stream.span_builder.span_from_offsets(stream.starts[first], stream.ends[last])
     
     def _advance(self) -> DMLToken:
         """Advance to next token."""
@@ -1240,24 +1438,28 @@ class EnhancedDMLParser:
     
     def _previous_token(self) -> DMLToken:
         """Get previous token."""
-        return self.tokens[self.position - 1]
+        return self._token_at(self.position - 1)
     
     def _is_at_end(self) -> bool:
         """Check if at end of tokens."""
-        return self._current_token().type == DMLTokenType.EOF
+        return self._types[self.position] == DMLTokenType.EOF
     
     def _check(self, token_type: DMLTokenType) -> bool:
         """Check if current token matches type."""
-        if self._is_at_end():
-            return False
-        return self._current_token().type == token_type
+        current = self._types[self.position]
+        return current == token_type and current != DMLTokenType.EOF
+    
+    def _before(self, token_type: DMLTokenType) -> bool:
+        """Check that neither token_type nor EOF is the current token."""
+        current = self._types[self.position]
+        return current != token_type and current != DMLTokenType.EOF
     
     def _match(self, *token_types: DMLTokenType) -> bool:
         """Check if current token matches any of the types."""
-        for token_type in token_types:
-            if self._check(token_type):
-                self._advance()
-                return True
+        current = self._types[self.position]
+        if current in token_types and current != DMLTokenType.EOF:
+            self.position += 1
+            return True
         return False
     
     def _consume(self, token_type: DMLTokenType, message: str) -> DMLToken:
@@ -1282,88 +1484,64 @@ class EnhancedDMLParser:
     def _synchronize(self) -> None:
         """Synchronize after parse error."""
         self._in_recovery = True
-        self._advance()
-        
-        while not self._is_at_end():
-            if self._previous_token().type == DMLTokenType.SEMICOLON:
-                self._in_recovery = False
-                return
-            
-            if self._current_token().type in {
-                DMLTokenType.DEVICE, DMLTokenType.TEMPLATE, DMLTokenType.BANK,
-                DMLTokenType.REGISTER, DMLTokenType.FIELD, DMLTokenType.METHOD,
-                DMLTokenType.PARAMETER, DMLTokenType.IMPORT, DMLTokenType.DML
-            }:
-                self._in_recovery = False
-                return
-            
-            self._advance()
+        types = self._types
+        anchors = self._RECOVERY_ANCHORS
+        position = self.position
+        if types[position] != DMLTokenType.EOF:
+            position += 1
+        
+        # Stop after a ';' or before a keyword that starts a declaration
+        while (current := types[position]) != DMLTokenType.EOF:
+            if types[position - 1] == DMLTokenType.SEMICOLON or anchors[current]:
+                break
+            position += 1
         
+        self.position = position
         self._in_recovery = False
     
     # Top-level parsing methods
     def _parse_top_level_declaration(self) -> Optional[DMLDeclaration]:
         """Parse a top-level declaration."""
-        if self._match(DMLTokenType.DML):
-            return self._parse_dml_version()
-        elif self._match(DMLTokenType.IMPORT):
-            return self._parse_import()
-        elif self._match(DMLTokenType.DEVICE):
-            return self._parse_device()
-        elif self._match(DMLTokenType.TEMPLATE):
-            return self._parse_template()
-        elif self._match(DMLTokenType.TYPEDEF):
-            return self._parse_typedef()
-        elif self._match(DMLTokenType.PARAMETER):
-            return self._parse_parameter()
-        elif self._match(DMLTokenType.CONNECT):
-            return self._parse_connect()
-        elif self._match(DMLTokenType.BANK):
-            return self._parse_bank()
-        elif self._match(DMLTokenType.ATTRIBUTE):
-            return self._parse_attribute()
-        elif self._match(DMLTokenType.EVENT):
-            return self._parse_event()
-        elif self._match(DMLTokenType.GROUP):
-            return self._parse_group()
-        elif self._match(DMLTokenType.CONSTANT):
-            return self._parse_constant()
-        else:
+        parse = self._top_dispatch.get(self._types[self.position])
+        if parse is None:
             # Skip unknown tokens and try to recover
             self._advance()
             return None
+        
+        self.position += 1  # Consume the keyword; EOF has no parser
+        return parse()
     
     def _parse_dml_version(self) -> DMLVersionDeclaration:
         """Parse DML version declaration."""
-        start_span = self._previous_token().span
+        start_index = self.position - 1
         
         version_token = self._consume(DMLTokenType.NUMBER, "Expected version number after 'dml'")
         self._consume(DMLTokenType.SEMICOLON, "Expected ';' after DML version")
         
         self.dml_version = version_token.value
         
-        end_span = self._previous_token().span
-        combined_span = ZeroSpan(start_span.file_path, ZeroRange(start_span.range.start, end_span.range.end))
+        end_index = self.position - 1
+        combined_span = self._span_between(start_index, end_index)
         
         return DMLVersionDeclaration(combined_span, version_token.value)
     
     def _parse_import(self) -> ImportDeclaration:
         """Parse import declaration."""
-        start_span = self._previous_token().span
+        start_index = self.position - 1
         
         module_token = self._consume(DMLTokenType.STRING, "Expected module name after 'import'")
         self._consume(DMLTokenType.SEMICOLON, "Expected ';' after import")
         
         self.imports.append(module_token.value)
         
-        end_span = self._previous_token().span
-        combined_span = ZeroSpan(start_span.file_path, ZeroRange(start_span.range.start, end_span.range.end))
+        end_index = self.position - 1
+        combined_span = self._span_between(start_index, end_index)
         
         return ImportDeclaration(combined_span, module_token.value)
     
     def _parse_device(self) -> DeviceDeclaration:
         """Parse device declaration."""
-        start_span = self._previous_token().span
+        start_index = self.position - 1
         
         name_token = self._consume(DMLTokenType.IDENTIFIER, "Expected device name")
         
@@ -1382,8 +1560,8 @@ class EnhancedDMLParser:
         # Example: device watchdog_timer;
         self._consume(DMLTokenType.SEMICOLON, "Expected ';' after device declaration")
         
-        end_span = self._previous_token().span
-        combined_span = ZeroSpan(start_span.file_path, ZeroRange(start_span.range.start, end_span.range.end))
+        end_index = self.position - 1
+        combined_span = self._span_between(start_index, end_index)
         
         # Device body is defined elsewhere in the file, not inline
         parameters = []
@@ -1394,7 +1572,7 @@ class EnhancedDMLParser:
     
     def _parse_template(self) -> TemplateDeclaration:
         """Parse template declaration."""
-        start_span = self._previous_token().span
+        start_index = self.position - 1
         
         name_token = self._consume(DMLTokenType.IDENTIFIER, "Expected template name")
         self._consume(DMLTokenType.LEFT_BRACE, "Expected '{' after template name")
@@ -1406,7 +1584,7 @@ class EnhancedDMLParser:
         registers = []
         banks = []
         
-        while not self._check(DMLTokenType.RIGHT_BRACE) and not self._is_at_end():
+        while self._before(DMLTokenType.RIGHT_BRACE):
             if self._match(DMLTokenType.PARAMETER):
                 parameters.append(self._parse_parameter())
             elif self._match(DMLTokenType.METHOD):
@@ -1422,14 +1600,14 @@ class EnhancedDMLParser:
         
         self._consume(DMLTokenType.RIGHT_BRACE, "Expected '}' after template body")
         
-        end_span = self._previous_token().span
-        combined_span = ZeroSpan(start_span.file_path, ZeroRange(start_span.range.start, end_span.range.end))
+        end_index = self.position - 1
+        combined_span = self._span_between(start_index, end_index)
         
         return TemplateDeclaration(combined_span, name_token.value, parameters, methods, fields, registers, banks)
     
     def _parse_parameter(self) -> ParameterDeclaration:
         """Parse parameter declaration."""
-        start_span = self._previous_token().span
+        start_index = self.position - 1
         
         name_token = self._consume(DMLTokenType.IDENTIFIER, "Expected parameter name")
         
@@ -1446,201 +1624,88 @@ class EnhancedDMLParser:
         
         self._consume(DMLTokenType.SEMICOLON, "Expected ';' after parameter")
         
-        end_span = self._previous_token().span
-        combined_span = ZeroSpan(start_span.file_path, ZeroRange(start_span.range.start, end_span.range.end))
+        end_index = self.position - 1
+        combined_span = self._span_between(start_index, end_index)
         
         return ParameterDeclaration(combined_span, name_token.value, parameter_type, default_value)
     
     def _parse_typedef(self) -> Optional[DMLDeclaration]:
         """Parse typedef declaration (basic implementation)."""
         # Skip typedef for now - complex type system
-        while not self._check(DMLTokenType.SEMICOLON) and not self._is_at_end():
+        while self._before(DMLTokenType.SEMICOLON):
             self._advance()
         self._consume(DMLTokenType.SEMICOLON, "Expected ';' after typedef")
         return None
     
+    # Symbol kind, list counted in the detail, and bound detail/documentation
+    # formatters for each declaration type that contributes a symbol
+    _DECLARATION_SYMBOLS = {
+        DeviceDeclaration: (DMLSymbolKind.DEVICE, 'parameters',
+                            "Device with {} parameters".format, "DML device {}".format),
+        TemplateDeclaration: (DMLSymbolKind.TEMPLATE, 'parameters',
+                              "Template with {} parameters".format, "DML template {}".format),
+        ConnectDeclaration: (DMLSymbolKind.CONNECT, 'parameters',
+                             "Connect with {} parameters".format, "Connect {}".format),
+        BankDeclaration: (DMLSymbolKind.BANK, 'registers',
+                          "Bank with {} registers".format, "Bank {}".format),
+        AttributeDeclaration: (DMLSymbolKind.ATTRIBUTE, None, "Attribute".format, "Attribute {}".format),
+        ParameterDeclaration: (DMLSymbolKind.PARAMETER, None, "Parameter".format, "Parameter {}".format),
+    }
+    
+    def _add_symbol(self, name: str, kind: DMLSymbolKind, span: ZeroSpan,
+                    detail: str, documentation: str) -> None:
+        """Record a symbol located at span."""
+        self.symbols.append(DMLSymbol(name, kind, DMLLocation(span), detail, documentation))
+    
     def _extract_symbols_from_declaration(self, declaration: DMLDeclaration) -> None:
         """Extract symbols from AST declarations."""
+        add = self._add_symbol
         try:
+            spec = self._DECLARATION_SYMBOLS.get(type(declaration))
+            if spec is not None:
+                kind, counted, detail, documentation = spec
+                name = declaration.name
+                count = len(getattr(declaration, counted)) if counted else None
+                add(name, kind, declaration.span, detail(count), documentation(name))
+            
             if isinstance(declaration, DeviceDeclaration):
-                # Add device symbol
-                device_symbol = DMLSymbol(
-                    name=declaration.name,
-                    kind=DMLSymbolKind.DEVICE,
-                    location=DMLLocation(span=declaration.span),
-                    detail=f"Device with {len(declaration.parameters)} parameters",
-                    documentation=f"DML device {declaration.name}"
-                )
-                self.symbols.append(device_symbol)
-                
-                # Add parameter symbols
                 for param in declaration.parameters:
-                    param_symbol = DMLSymbol(
-                        name=param.name,
-                        kind=DMLSymbolKind.PARAMETER,
-                        location=DMLLocation(span=param.span),
-                        detail=f"Device parameter",
-                        documentation=f"Parameter {param.name}"
-                    )
-                    self.symbols.append(param_symbol)
-                
-                # Add method symbols
+                    add(param.name, DMLSymbolKind.PARAMETER, param.span,
+                        "Device parameter", f"Parameter {param.name}")
                 for method in declaration.methods:
-                    method_symbol = DMLSymbol(
-                        name=method.name,
-                        kind=DMLSymbolKind.METHOD,
-                        location=DMLLocation(span=method.span),
-                        detail=f"Device method",
-                        documentation=f"Method {method.name}"
-                    )
-                    self.symbols.append(method_symbol)
-                
-                # Add bank symbols
+                    add(method.name, DMLSymbolKind.METHOD, method.span,
+                        "Device method", f"Method {method.name}")
                 for bank in declaration.banks:
-                    bank_symbol = DMLSymbol(
-                        name=bank.name,
-                        kind=DMLSymbolKind.BANK,
-                        location=DMLLocation(span=bank.span),
-                        detail=f"Register bank",
-                        documentation=f"Bank {bank.name}"
-                    )
-                    self.symbols.append(bank_symbol)
+                    add(bank.name, DMLSymbolKind.BANK, bank.span,
+                        "Register bank", f"Bank {bank.name}")
             
             elif isinstance(declaration, TemplateDeclaration):
-                # Add template symbol
-                template_symbol = DMLSymbol(
-                    name=declaration.name,
-                    kind=DMLSymbolKind.TEMPLATE,
-                    location=DMLLocation(span=declaration.span),
-                    detail=f"Template with {len(declaration.parameters)} parameters",
-                    documentation=f"DML template {declaration.name}"
-                )
-                self.symbols.append(template_symbol)
-                
-                # Add template parameter symbols
                 for param in declaration.parameters:
-                    param_symbol = DMLSymbol(
-                        name=param.name,
-                        kind=DMLSymbolKind.PARAMETER,
-                        location=DMLLocation(span=param.span),
-                        detail=f"Template parameter",
-                        documentation=f"Template parameter {param.name}"
-                    )
-                    self.symbols.append(param_symbol)
+                    add(param.name, DMLSymbolKind.PARAMETER, param.span,
+                        "Template parameter", f"Template parameter {param.name}")
+            
+            elif isinstance(declaration, BankDeclaration):
+                for register in declaration.registers:
+                    add(register.name, DMLSymbolKind.REGISTER, register.span,
+                        f"Register in bank {declaration.name}", f"Register {register.name}")
+                    
+                    method_detail = f"Method in register {register.name}"
+                    for method in getattr(register, 'methods', ()):
+                        add(method.name, DMLSymbolKind.METHOD, method.span,
+                            method_detail, f"Method {method.name}")
             
             elif isinstance(declaration, ImportDeclaration):
                 # Add import symbol - only if module_name is valid
                 if declaration.module_name and declaration.module_name.strip():
-                    import_symbol = DMLSymbol(
-                        name=declaration.module_name,
-                        kind=DMLSymbolKind.MODULE,
-                        location=DMLLocation(span=declaration.span),
-                        detail=f"Imported module",
-                        documentation=f"Import {declaration.module_name}"
-                    )
-                    self.symbols.append(import_symbol)
+                    add(declaration.module_name, DMLSymbolKind.MODULE, declaration.span,
+                        "Imported module", f"Import {declaration.module_name}")
                 else:
                     logger.debug(f"Skipping ImportDeclaration with empty or invalid module_name at {declaration.span}")
             
             elif isinstance(declaration, DMLVersionDeclaration):
-                # Add version symbol
-                version_symbol = DMLSymbol(
-                    name="dml",
-                    kind=DMLSymbolKind.CONSTANT,
-                    location=DMLLocation(span=declaration.span),
-                    detail=f"DML version {declaration.version}",
-                    documentation=f"DML language version {declaration.version}"
-                )
-                self.symbols.append(version_symbol)
-            
-            elif isinstance(declaration, ConnectDeclaration):
-                # Add connect symbol
-                connect_symbol = DMLSymbol(
-                    name=declaration.name,
-                    kind=DMLSymbolKind.CONNECT,
-                    location=DMLLocation(span=declaration.span),
-                    detail=f"Connect with {len(declaration.parameters)} parameters",
-                    documentation=f"Connect {declaration.name}"
-                )
-                self.symbols.append(connect_symbol)
-            
-            elif isinstance(declaration, BankDeclaration):
-                # Add bank symbol
-                bank_symbol = DMLSymbol(
-                    name=declaration.name,
-                    kind=DMLSymbolKind.BANK,
-                    location=DMLLocation(span=declaration.span),
-                    detail=f"Bank with {len(declaration.registers)} registers",
-                    documentation=f"Bank {declaration.name}"
-                )
-                self.symbols.append(bank_symbol)
-                
-                # Add register symbols from bank
-                for register in declaration.registers:
-                    register_symbol = DMLSymbol(
-                        name=register.name,
-                        kind=DMLSymbolKind.REGISTER,
-                        location=DMLLocation(span=register.span),
-                        detail=f"Register in bank {declaration.name}",
-                        documentation=f"Register {register.name}"
-                    )
-                    self.symbols.append(register_symbol)
-                    
-                    # Add method symbols from register
-                    if hasattr(register, 'methods'):
-                        for method in register.methods:
-                            method_symbol = DMLSymbol(
-                                name=method.name,
-                                kind=DMLSymbolKind.METHOD,
-                                location=DMLLocation(span=method.span),
-                                detail=f"Method in register {register.name}",
-                                documentation=f"Method {method.name}"
-                            )
-                            self.symbols.append(method_symbol)
-            
-            elif isinstance(declaration, AttributeDeclaration):
-                # Add attribute symbol
-                attr_symbol = DMLSymbol(
-                    name=declaration.name,
-                    kind=DMLSymbolKind.ATTRIBUTE,
-                    location=DMLLocation(span=declaration.span),
-                    detail=f"Attribute",
-                    documentation=f"Attribute {declaration.name}"
-                )
-                self.symbols.append(attr_symbol)
-            
-            elif isinstance(declaration, EventDeclaration):
-                # Add event symbol
-                event_symbol = DMLSymbol(
-                    name=declaration.name,
-                    kind=DMLSymbolKind.EVENT,
-                    location=DMLLocation(span=declaration.span),
-                    detail=f"Event",
-                    documentation=f"Event {declaration.name}"
-                )
-                self.symbols.append(event_symbol)
-            
-            elif isinstance(declaration, GroupDeclaration):
-                # Add group symbol
-                group_symbol = DMLSymbol(
-                    name=declaration.name,
-                    kind=DMLSymbolKind.GROUP,
-                    location=DMLLocation(span=declaration.span),
-                    detail=f"Group",
-                    documentation=f"Group {declaration.name}"
-                )
-                self.symbols.append(group_symbol)
-            
-            elif isinstance(declaration, ParameterDeclaration):
-                # Add parameter symbol (top-level parameter)
-                param_symbol = DMLSymbol(
-                    name=declaration.name,
-                    kind=DMLSymbolKind.PARAMETER,
-                    location=DMLLocation(span=declaration.span),
-                    detail=f"Parameter",
-                    documentation=f"Parameter {declaration.name}"
-                )
-                self.symbols.append(param_symbol)
+                add("dml", DMLSymbolKind.CONSTANT, declaration.span,
+                    f"DML version {declaration.version}",
+                    f"DML language version {declaration.version}")
                 
         except Exception as e:
             decl_name = getattr(declaration, 'name', None) or getattr(declaration, 'module_name', 'unknown')
@@ -1731,15 +1796,18 @@ class EnhancedDMLParser:
         # Track brace depth to handle nested blocks correctly
         brace_depth = 1  # We already consumed the opening brace
         
-        while brace_depth > 0 and not self._is_at_end():
-            current = self._current_token()
-            if current.type == DMLTokenType.LEFT_BRACE:
+        # Skip the body on the type array alone; its tokens are never read
+        types = self._types
+        position = self.position
+        while (current := types[position]) != DMLTokenType.EOF:
+            if current == DMLTokenType.LEFT_BRACE:
                 brace_depth += 1
-            elif current.type == DMLTokenType.RIGHT_BRACE:
+            elif current == DMLTokenType.RIGHT_BRACE:
                 brace_depth -= 1
                 if brace_depth == 0:
                     break  # Don't consume the closing brace yet
-            self._advance()
+            position += 1
+        self.position = position
         
         end_token = self._consume(DMLTokenType.RIGHT_BRACE, "Expected '}'")
         
@@ -1752,7 +1820,7 @@ class EnhancedDMLParser:
     
     def _parse_method(self) -> MethodDeclaration:
         """Parse method declaration with modifiers."""
-        start_span = self._previous_token().span
+        start_index = self.position - 1
         
         # Parse optional modifiers before method name
         modifier = None
@@ -1820,15 +1888,15 @@ class EnhancedDMLParser:
         else:
             self._consume(DMLTokenType.SEMICOLON, "Expected ';' or '{' after method signature")
         
-        end_span = self._previous_token().span
-        combined_span = ZeroSpan(start_span.file_path, ZeroRange(start_span.range.start, end_span.range.end))
+        end_index = self.position - 1
+        combined_span = self._span_between(start_index, end_index)
         
         return MethodDeclaration(combined_span, name_token.value, parameters, return_type, body,
                                 modifier, independent, startup, memoized, throws, default)
     
     def _parse_field(self) -> FieldDeclaration:
         """Parse field declaration."""
-        start_span = self._previous_token().span
+        start_index = self.position - 1
         
         name_token = self._consume(DMLTokenType.IDENTIFIER, "Expected field name")
         
@@ -1849,12 +1917,12 @@ class EnhancedDMLParser:
         
         if self._match(DMLTokenType.SEMICOLON):
             # Simple field declaration without body
-            end_span = self._previous_token().span
+            end_index = self.position - 1
         else:
             self._consume(DMLTokenType.LEFT_BRACE, "Expected '{' or ';' after field name")
             
             # Parse field body
-            while not self._check(DMLTokenType.RIGHT_BRACE) and not self._is_at_end():
+            while self._before(DMLTokenType.RIGHT_BRACE):
                 if self._match(DMLTokenType.PARAMETER):
                     parameters.append(self._parse_parameter())
                 elif self._match(DMLTokenType.METHOD):
@@ -1863,15 +1931,15 @@ class EnhancedDMLParser:
                     self._advance()  # Skip unknown tokens
             
             self._consume(DMLTokenType.RIGHT_BRACE, "Expected '}' after field body")
-            end_span = self._previous_token().span
+            end_index = self.position - 1
         
-        combined_span = ZeroSpan(start_span.file_path, ZeroRange(start_span.range.start, end_span.range.end))
+        combined_span = self._span_between(start_index, end_index)
         
         return FieldDeclaration(combined_span, name_token.value, size, parameters, methods)
     
     def _parse_register(self) -> RegisterDeclaration:
         """Parse register declaration."""
-        start_span = self._previous_token().span
+        start_index = self.position - 1
         
         name_token = self._consume(DMLTokenType.IDENTIFIER, "Expected register name")
         
@@ -1910,7 +1978,7 @@ class EnhancedDMLParser:
         fields = []
         methods = []
         
-        while not self._check(DMLTokenType.RIGHT_BRACE) and not self._is_at_end():
+        while self._before(DMLTokenType.RIGHT_BRACE):
             if self._match(DMLTokenType.PARAMETER):
                 parameters.append(self._parse_parameter())
             elif self._match(DMLTokenType.FIELD):
@@ -1922,14 +1990,14 @@ class EnhancedDMLParser:
         
         self._consume(DMLTokenType.RIGHT_BRACE, "Expected '}' after register body")
         
-        end_span = self._previous_token().span
-        combined_span = ZeroSpan(start_span.file_path, ZeroRange(start_span.range.start, end_span.range.end))
+        end_index = self.position - 1
+        combined_span = self._span_between(start_index, end_index)
         
         return RegisterDeclaration(combined_span, name_token.value, size, offset, parameters, fields, methods)
     
     def _parse_bank(self) -> BankDeclaration:
         """Parse bank declaration."""
-        start_span = self._previous_token().span
+        start_index = self.position - 1
         
         name_token = self._consume(DMLTokenType.IDENTIFIER, "Expected bank name")
         self._consume(DMLTokenType.LEFT_BRACE, "Expected '{' after bank name")
@@ -1939,7 +2007,7 @@ class EnhancedDMLParser:
         registers = []
         methods = []
         
-        while not self._check(DMLTokenType.RIGHT_BRACE) and not self._is_at_end():
+        while self._before(DMLTokenType.RIGHT_BRACE):
             if self._match(DMLTokenType.PARAMETER):
                 parameters.append(self._parse_parameter())
             elif self._match(DMLTokenType.REGISTER):
@@ -1951,14 +2019,14 @@ class EnhancedDMLParser:
         
         self._consume(DMLTokenType.RIGHT_BRACE, "Expected '}' after bank body")
         
-        end_span = self._previous_token().span
-        combined_span = ZeroSpan(start_span.file_path, ZeroRange(start_span.range.start, end_span.range.end))
+        end_index = self.position - 1
+        combined_span = self._span_between(start_index, end_index)
         
         return BankDeclaration(combined_span, name_token.value, parameters, registers, methods)
     
     def _parse_connect(self) -> ConnectDeclaration:
         """Parse connect declaration."""
-        start_span = self._previous_token().span
+        start_index = self.position - 1
         
         name_token = self._consume(DMLTokenType.IDENTIFIER, "Expected connect name")
         
@@ -1972,7 +2040,7 @@ class EnhancedDMLParser:
         
         # Parse connect body
         parameters = []
-        while not self._check(DMLTokenType.RIGHT_BRACE) and not self._is_at_end():
+        while self._before(DMLTokenType.RIGHT_BRACE):
             if self._match(DMLTokenType.PARAMETER):
                 parameters.append(self._parse_parameter())
             else:
@@ -1980,21 +2048,21 @@ class EnhancedDMLParser:
         
         self._consume(DMLTokenType.RIGHT_BRACE, "Expected '}' after connect body")
         
-        end_span = self._previous_token().span
-        combined_span = ZeroSpan(start_span.file_path, ZeroRange(start_span.range.start, end_span.range.end))
+        end_index = self.position - 1
+        combined_span = self._span_between(start_index, end_index)
         
         return ConnectDeclaration(combined_span, name_token.value, parameters)
     
     def _parse_attribute(self) -> AttributeDeclaration:
         """Parse attribute declaration."""
-        start_span = self._previous_token().span
+        start_index = self.position - 1
         
         name_token = self._consume(DMLTokenType.IDENTIFIER, "Expected attribute name")
         self._consume(DMLTokenType.LEFT_BRACE, "Expected '{' after attribute name")
         
         # Parse attribute body
         parameters = []
-        while not self._check(DMLTokenType.RIGHT_BRACE) and not self._is_at_end():
+        while self._before(DMLTokenType.RIGHT_BRACE):
             if self._match(DMLTokenType.PARAMETER):
                 parameters.append(self._parse_parameter())
             else:
@@ -2002,21 +2070,21 @@ class EnhancedDMLParser:
         
         self._consume(DMLTokenType.RIGHT_BRACE, "Expected '}' after attribute body")
         
-        end_span = self._previous_token().span
-        combined_span = ZeroSpan(start_span.file_path, ZeroRange(start_span.range.start, end_span.range.end))
+        end_index = self.position - 1
+        combined_span = self._span_between(start_index, end_index)
         
         return AttributeDeclaration(combined_span, name_token.value, parameters)
     
     def _parse_event(self) -> EventDeclaration:
         """Parse event declaration."""
-        start_span = self._previous_token().span
+        start_index = self.position - 1
         
         name_token = self._consume(DMLTokenType.IDENTIFIER, "Expected event name")
         self._consume(DMLTokenType.LEFT_BRACE, "Expected '{' after event name")
         
         # Parse event body
         parameters = []
-        while not self._check(DMLTokenType.RIGHT_BRACE) and not self._is_at_end():
+        while self._before(DMLTokenType.RIGHT_BRACE):
             if self._match(DMLTokenType.PARAMETER):
                 parameters.append(self._parse_parameter())
             else:
@@ -2024,21 +2092,21 @@ class EnhancedDMLParser:
         
         self._consume(DMLTokenType.RIGHT_BRACE, "Expected '}' after event body")
         
-        end_span = self._previous_token().span
-        combined_span = ZeroSpan(start_span.file_path, ZeroRange(start_span.range.start, end_span.range.end))
+        end_index = self.position - 1
+        combined_span = self._span_between(start_index, end_index)
         
         return EventDeclaration(combined_span, name_token.value, parameters)
     
     def _parse_group(self) -> GroupDeclaration:
         """Parse group declaration."""
-        start_span = self._previous_token().span
+        start_index = self.position - 1
         
         name_token = self._consume(DMLTokenType.IDENTIFIER, "Expected group name")
         self._consume(DMLTokenType.LEFT_BRACE, "Expected '{' after group name")
         
         # Parse group body
         parameters = []
-        while not self._check(DMLTokenType.RIGHT_BRACE) and not self._is_at_end():
+        while self._before(DMLTokenType.RIGHT_BRACE):
             if self._match(DMLTokenType.PARAMETER):
                 parameters.append(self._parse_parameter())
             else:
@@ -2046,40 +2114,32 @@ class EnhancedDMLParser:
         
         self._consume(DMLTokenType.RIGHT_BRACE, "Expected '}' after group body")
         
-        end_span = self._previous_token().span
-        combined_span = ZeroSpan(start_span.file_path, ZeroRange(start_span.range.start, end_span.range.end))
+        end_index = self.position - 1
+        combined_span = self._span_between(start_index, end_index)
         
         return GroupDeclaration(combined_span, name_token.value, parameters)
     
     def _parse_constant(self) -> 'ConstantDeclaration':
         """Parse constant declaration."""
-        start_span = self._previous_token().span
+        start_index = self.position - 1
         
         name_token = self._consume(DMLTokenType.IDENTIFIER, "Expected constant name")
         self._consume(DMLTokenType.ASSIGN, "Expected '=' after constant name")
         
         # Parse constant value (simplified - just consume until semicolon)
         value_tokens = []
-        while not self._check(DMLTokenType.SEMICOLON) and not self._is_at_end():
+        while self._before(DMLTokenType.SEMICOLON):
             value_tokens.append(self._current_token().value)
             self._advance()
         
         self._consume(DMLTokenType.SEMICOLON, "Expected ';' after constant value")
         
-        end_span = self._previous_token().span
-        combined_span = ZeroSpan(start_span.file_path, ZeroRange(start_span.range.start, end_span.range.end))
+        end_index = self.position - 1
+        combined_span = self._span_between(start_index, end_index)
         
         # For now, just store the value as a string
         value = ' '.join(str(v) for v in value_tokens)
         
-        # Create a simple constant declaration (we'll need to define this class)
-        from dataclasses import dataclass
-        @dataclass
-        class ConstantDeclaration(DMLDeclaration):
-            value: str
-            def accept(self, visitor):
-                return visitor.visit_constant(self)
-        
         return ConstantDeclaration(combined_span, name_token.value, value)
     
     def _parse_variable_declaration(self) -> VariableDeclaration:
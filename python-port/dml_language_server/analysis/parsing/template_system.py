@@ -356,9 +356,9 @@ class TemplateSystem:
     def initialize_template_scope(self, global_scope) -> None:
         """Initialize template scope within global scope."""
         template_span = ZeroSpan("templates", ZeroRange(ZeroPosition(0, 0), ZeroPosition(0, 0)))
-        # Import SymbolScope here to avoid circular imports
-        from .. import SymbolScope
-        self.template_scope = SymbolScope("templates", template_span, global_scope)
+        # Create the scope through the global scope's class; importing
+        # SymbolScope here would be circular and cost a lookup per file
+        self.template_scope = type(global_scope)("templates", template_span, global_scope)
     
     def add_template(self, template: TemplateDeclaration) -> None:
         """Add a template to the system."""
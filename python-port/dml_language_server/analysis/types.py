@@ -5,26 +5,38 @@ Shared types and classes for DML analysis.
 SPDX-License-Identifier: Apache-2.0 and MIT
 """
 
+import sys
 from typing import List, Optional
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import Enum, IntEnum
 
 from ..span import ZeroSpan
 from ..lsp_data import DMLDiagnostic, DMLDiagnosticSeverity
 
+# Options for high-volume dataclasses; slots need Python 3.10+
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-class DMLErrorKind(Enum):
+
+class DMLErrorKind(IntEnum):
     """Enhanced types of DML errors."""
-    SYNTAX_ERROR = "syntax_error"
-    SEMANTIC_ERROR = "semantic_error"
-    TYPE_ERROR = "type_error"
-    UNDEFINED_SYMBOL = "undefined_symbol"
-    DUPLICATE_SYMBOL = "duplicate_symbol"
-    IMPORT_ERROR = "import_error"
-    TEMPLATE_ERROR = "template_error"
-    SCOPE_ERROR = "scope_error"
-    REFERENCE_ERROR = "reference_error"
-    CIRCULAR_DEPENDENCY = "circular_dependency"
+    SYNTAX_ERROR = 1
+    SEMANTIC_ERROR = 2
+    TYPE_ERROR = 3
+    UNDEFINED_SYMBOL = 4
+    DUPLICATE_SYMBOL = 5
+    IMPORT_ERROR = 6
+    TEMPLATE_ERROR = 7
+    SCOPE_ERROR = 8
+    REFERENCE_ERROR = 9
+    CIRCULAR_DEPENDENCY = 10
+    
+    @property
+    def label(self) -> str:
+        """Stable textual name used in reports, e.g. 'syntax_error'."""
+        return _ERROR_KIND_LABELS[self]
+
+
+_ERROR_KIND_LABELS = {kind: kind.name.lower() for kind in DMLErrorKind}
 
 
 class ReferenceKind(Enum):
@@ -37,7 +49,7 @@ class ReferenceKind(Enum):
     CONSTANT = "constant"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class DMLError:
     """Represents an error in DML code."""
     kind: DMLErrorKind
@@ -45,15 +57,19 @@ class DMLError:
     span: ZeroSpan
     severity: DMLDiagnosticSeverity = DMLDiagnosticSeverity.ERROR
     code: Optional[str] = None
+    _diagnostic: Optional[DMLDiagnostic] = field(default=None, init=False, repr=False, compare=False)
     
     def to_diagnostic(self) -> DMLDiagnostic:
         """Convert to diagnostic."""
-        return DMLDiagnostic(
-            span=self.span,
-            message=self.message,
-            severity=self.severity,
-            code=self.code
-        )
+        # Errors are not modified after creation, so convert only once
+        if self._diagnostic is None:
+            self._diagnostic = DMLDiagnostic(
+                span=self.span,
+                message=self.message,
+                severity=self.severity,
+                code=self.code
+            )
+        return self._diagnostic
 
 
 @dataclass
@@ -73,7 +89,7 @@ class NodeRef:
         return str(self)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class SymbolReference:
     """Enhanced symbol reference with kind and location."""
     node_ref: NodeRef
@@ -96,6 +96,12 @@ class Config:
         self._workspace_root: Optional[Path] = None
         self._include_paths: List[Path] = []
         self._dmlc_flags: List[str] = []
+        self._revision = 0
+    
+    @property
+    def revision(self) -> int:
+        """Counter bumped whenever include paths or compile commands change."""
+        return self._revision
     
     @property
     def workspace_root(self) -> Optional[Path]:
@@ -156,6 +162,7 @@ class Config:
                 
                 logger.debug(f"Loaded compile info for {device_path}: {compile_info}")
             
+            self._revision += 1
             logger.info(f"Loaded compile commands for {len(self._compile_commands)} devices from {path}")
             
         except Exception as e:
@@ -277,6 +284,7 @@ class Config:
         path = path.resolve()
         if path not in self._include_paths:
             self._include_paths.append(path)
+            self._revision += 1
             logger.debug(f"Added include path: {path}")
     
     def add_dmlc_flag(self, flag: str) -> None:
@@ -297,6 +305,7 @@ class Config:
         self._workspace_root = None
         self._include_paths.clear()
         self._dmlc_flags.clear()
+        self._revision += 1
         logger.debug("Configuration cleared")
     
     def to_dict(self) -> Dict[str, Any]:
@@ -217,7 +217,7 @@ def main(
                     'error_count': len(result.errors),
                     'errors': [
                         {
-                            'kind': error.kind.value,
+                            'kind': error.kind.label,
                             'message': error.message,
                             'severity': error.severity.value,
                             'line': error.span.start.line + 1,
@@ -6,8 +6,11 @@ SPDX-License-Identifier: Apache-2.0 and MIT
 """
 
 import logging
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Set, Optional, Dict
+from typing import List, Set, Optional, Dict, Tuple
 import re
 from dataclasses import dataclass
 
@@ -33,11 +36,49 @@ class FileInfo:
 class FileManager:
     """Manages DML file discovery, categorization, and dependencies."""
     
+    # Number of file contents kept for read_cached
+    CONTENT_CACHE_SIZE = 256
+    
     def __init__(self, config: Config):
         self.config = config
         self._file_cache: Dict[Path, FileInfo] = {}
         self._dependency_graph: Dict[Path, Set[Path]] = {}
         self._reverse_dependencies: Dict[Path, Set[Path]] = {}
+        # Last read content per file, with the (mtime, size) it was read at
+        self._content_cache: 'OrderedDict[Path, Tuple[Tuple[int, int], str]]' = OrderedDict()
+        self._content_lock = threading.Lock()
+    
+    def read_cached(self, file_path: Path) -> str:
+        """
+        Read the text of a file, reusing the last read while it is unchanged.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            File content
+            
+        Raises:
+            OSError: If the file cannot be read
+        """
+        stat = os.stat(file_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        
+        with self._content_lock:
+            cached = self._content_cache.get(file_path)
+            if cached is not None and cached[0] == stamp:
+                self._content_cache.move_to_end(file_path)
+                return cached[1]
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        with self._content_lock:
+            self._content_cache[file_path] = (stamp, content)
+            self._content_cache.move_to_end(file_path)
+            if len(self._content_cache) > self.CONTENT_CACHE_SIZE:
+                self._content_cache.popitem(last=False)
+        return content
     
     def discover_dml_files(self, root_directory: Path, recursive: bool = True) -> List[Path]:
         """
@@ -107,8 +148,7 @@ class FileManager:
         Returns:
             FileInfo object
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = self.read_cached(file_path)
         
         info = FileInfo(path=file_path)
         
@@ -322,6 +362,8 @@ class FileManager:
         
         # Remove from caches
         self._file_cache.pop(file_path, None)
+        with self._content_lock:
+            self._content_cache.pop(file_path, None)
         self._dependency_graph.pop(file_path, None)
         self._reverse_dependencies.pop(file_path, None)
         
@@ -374,6 +416,8 @@ class FileManager:
     def clear_cache(self) -> None:
         """Clear all cached file information."""
         self._file_cache.clear()
+        with self._content_lock:
+            self._content_cache.clear()
         self._dependency_graph.clear()
         self._reverse_dependencies.clear()
         logger.debug("Cleared file manager cache")
@@ -63,10 +63,10 @@ def main(
     to provide syntactic and semantic analysis and feedback for DML files.
     """
     # Set up logging
-    if verbose:
-        logging.basicConfig(level=logging.DEBUG)
-    else:
-        logging.basicConfig(level=logging.INFO)
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
     
     logger.debug("DML Language Server starting")
     
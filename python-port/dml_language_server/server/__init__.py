@@ -119,6 +119,12 @@ class DMLLanguageServer(LanguageServer):
                 )
             )
         
+        @self.feature("shutdown")
+        async def shutdown(params: None) -> None:
+            """Handle shutdown request."""
+            logger.info("Shutting down DML Language Server")
+            self.analysis_engine.shutdown()
+        
         @self.feature("textDocument/didOpen")
         async def did_open(params: DidOpenTextDocumentParams) -> None:
             """Handle document open."""
@@ -149,8 +155,8 @@ class DMLLanguageServer(LanguageServer):
                 file_path = uri_to_path(uri)
                 self.vfs.write_file(file_path, content)
                 
-                # Re-analyze document
-                await self._analyze_document(uri, content)
+                # Re-analyze document once the burst of edits settles
+                await self._analyze_document(uri, content, debounce=True)
         
         @self.feature("textDocument/didClose")
         async def did_close(params: DidCloseTextDocumentParams) -> None:
@@ -168,6 +174,12 @@ class DMLLanguageServer(LanguageServer):
             uri = params.text_document.uri
             file_path = uri_to_path(uri)
             
+            # Don't wait out the debounce delay for the saved content; the
+            # pending analysis' future publishes its diagnostics
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.analysis_engine.analyze_file_now, file_path
+            )
+            
             # Save to disk if we have cached content
             if self.vfs.is_dirty(file_path):
                 await self.vfs.save_file(file_path)
@@ -309,13 +321,21 @@ class DMLLanguageServer(LanguageServer):
                 logger.error(f"Error in document symbol: {e}")
                 return []
     
-    async def _analyze_document(self, uri: str, content: str) -> None:
+    async def _analyze_document(self, uri: str, content: str, debounce: bool = False) -> None:
         """Analyze a document and publish diagnostics."""
         try:
             file_path = uri_to_path(uri)
             
             # Analyze the file
-            errors = self.analysis_engine.analyze_file(file_path, content)
+            if debounce:
+                future = self.analysis_engine.schedule_analysis(file_path, content)
+                errors = await asyncio.wrap_future(future)
+                
+                # Only the latest edit publishes the coalesced result
+                if self.open_documents.get(uri) is not content:
+                    return
+            else:
+                errors = self.analysis_engine.analyze_file(file_path, content)
             
             # Run linting if enabled
             if self.lint_engine and self.config.is_linting_enabled():
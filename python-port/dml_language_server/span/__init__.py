@@ -5,13 +5,18 @@ Span utilities for tracking positions and ranges in DML source code.
 SPDX-License-Identifier: Apache-2.0 and MIT
 """
 
-from typing import Generic, TypeVar, NamedTuple, Optional
+import heapq
+from bisect import bisect_right
+from typing import Generic, TypeVar, NamedTuple, Optional, Iterable, List, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
 # Type parameter for indexing system
 IndexType = TypeVar('IndexType')
 
+# Type parameter for values stored in a SpanIndex
+ValueType = TypeVar('ValueType')
+
 
 class IndexingSystem(Enum):
     """Different indexing systems for positions."""
@@ -29,9 +34,26 @@ class OneIndexed:
     pass
 
 
+class _FrozenSlots:
+    """Pickle support for frozen dataclasses that declare __slots__.
+    
+    Without a __dict__, unpickling would restore fields with setattr,
+    which a frozen dataclass rejects.
+    """
+    __slots__ = ()
+    
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+
 @dataclass(frozen=True)
-class Position(Generic[IndexType]):
+class Position(_FrozenSlots, Generic[IndexType]):
     """A position in a text document."""
+    __slots__ = ('line', 'column')
     line: int
     column: int
     
@@ -58,8 +80,9 @@ class Position(Generic[IndexType]):
 
 
 @dataclass(frozen=True)
-class Range(Generic[IndexType]):
+class Range(_FrozenSlots, Generic[IndexType]):
     """A range in a text document."""
+    __slots__ = ('start', 'end')
     start: Position[IndexType]
     end: Position[IndexType]
     
@@ -104,8 +127,9 @@ class Range(Generic[IndexType]):
 
 
 @dataclass(frozen=True)
-class Span(Generic[IndexType]):
+class Span(_FrozenSlots, Generic[IndexType]):
     """A span represents a location in source code with file information."""
+    __slots__ = ('file_path', 'range')
     file_path: Optional[str]
     range: Range[IndexType]
     
@@ -147,47 +171,49 @@ class SpanBuilder:
     
     def __init__(self, file_path: Optional[str] = None):
         self.file_path = file_path
-        self._lines: Optional[list] = None
+        self._line_offsets: Optional[List[int]] = None
+        self._length = 0
     
     def set_content(self, content: str) -> None:
         """Set the content to build spans from."""
-        self._lines = content.splitlines(keepends=True)
+        # Record where each line starts once, so lookups never rescan the text
+        offsets = [0]
+        find = content.find
+        newline = find('\n')
+        while newline != -1:
+            offsets.append(newline + 1)
+            newline = find('\n', newline + 1)
+        self._line_offsets = offsets
+        self._length = len(content)
     
     def position_from_offset(self, offset: int) -> Position[ZeroIndexed]:
         """Convert a byte offset to a zero-indexed position."""
-        if self._lines is None:
+        if self._line_offsets is None:
             raise ValueError("Content not set")
         
         if offset < 0:
             return Position[ZeroIndexed](0, 0)
         
-        current_offset = 0
-        for line_num, line in enumerate(self._lines):
-            line_length = len(line)
-            if current_offset + line_length > offset:
-                column = offset - current_offset
-                return Position[ZeroIndexed](line_num, column)
-            current_offset += line_length
-        
         # Past end of file
-        if self._lines:
-            last_line = len(self._lines) - 1
-            last_column = len(self._lines[-1])
-            return Position[ZeroIndexed](last_line, last_column)
-        else:
-            return Position[ZeroIndexed](0, 0)
+        offset = min(offset, self._length)
+        
+        line_num = bisect_right(self._line_offsets, offset) - 1
+        return Position[ZeroIndexed](line_num, offset - self._line_offsets[line_num])
     
     def offset_from_position(self, position: Position[ZeroIndexed]) -> int:
         """Convert a zero-indexed position to a byte offset."""
-        if self._lines is None:
+        if self._line_offsets is None:
             raise ValueError("Content not set")
         
-        if position.line < 0 or position.line >= len(self._lines):
+        if position.line < 0 or position.line >= len(self._line_offsets):
             return 0
         
-        offset = sum(len(line) for line in self._lines[:position.line])
-        offset += min(position.column, len(self._lines[position.line]))
-        return offset
+        line_start = self._line_offsets[position.line]
+        if position.line + 1 < len(self._line_offsets):
+            line_end = self._line_offsets[position.line + 1]
+        else:
+            line_end = self._length
+        return line_start + min(position.column, line_end - line_start)
     
     def span_from_offsets(self, start_offset: int, end_offset: int) -> Span[ZeroIndexed]:
         """Create a span from byte offsets."""
@@ -210,6 +236,56 @@ class SpanBuilder:
         return self.span_from_positions(position, position)
 
 
+class SpanIndex(Generic[ValueType]):
+    """
+    Point-lookup index over spans.
+    
+    Answers "which value's span contains this position" in O(log N). When
+    several spans contain the position, the value added first wins, matching
+    a linear scan over the entries in insertion order.
+    """
+    
+    def __init__(self, entries: Iterable[Tuple[Span, ValueType]]):
+        starts: dict = {}
+        ends: dict = {}
+        self._values: List[ValueType] = []
+        for span, value in entries:
+            priority = len(self._values)
+            self._values.append(value)
+            start = (span.range.start.line, span.range.start.column)
+            end = (span.range.end.line, span.range.end.column)
+            starts.setdefault(start, []).append(priority)
+            ends.setdefault(end, []).append(priority)
+        
+        # Sweep the sorted boundary points, recording the winning entry both
+        # at each point and in the open gap that follows it
+        self._points = sorted(starts.keys() | ends.keys())
+        self._at_point: List[int] = []
+        self._after_point: List[int] = []
+        active: List[int] = []
+        ended = set()
+        for point in self._points:
+            for priority in starts.get(point, ()):
+                heapq.heappush(active, priority)
+            self._at_point.append(active[0] if active else -1)
+            ended.update(ends.get(point, ()))
+            while active and active[0] in ended:
+                heapq.heappop(active)
+            self._after_point.append(active[0] if active else -1)
+    
+    def __len__(self) -> int:
+        return len(self._values)
+    
+    def find(self, position: Position) -> Optional[ValueType]:
+        """Get the first-added value whose span contains the position."""
+        key = (position.line, position.column)
+        i = bisect_right(self._points, key) - 1
+        if i < 0:
+            return None
+        priority = self._at_point[i] if self._points[i] == key else self._after_point[i]
+        return self._values[priority] if priority >= 0 else None
+
+
 def merge_spans(spans: list[Span[IndexType]]) -> Optional[Span[IndexType]]:
     """
     Merge multiple spans into a single span covering all of them.
@@ -253,6 +329,7 @@ __all__ = [
     "Range",
     "Span",
     "SpanBuilder",
+    "SpanIndex",
     "ZeroIndexed",
     "OneIndexed",
     "IndexingSystem",
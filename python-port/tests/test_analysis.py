@@ -0,0 +1,499 @@
+"""
+Tests for the DML analysis engine.
+
+© 2024 Intel Corporation
+SPDX-License-Identifier: Apache-2.0 and MIT
+"""
+
+import pickle
+import pytest
+import threading
+from collections import OrderedDict
+
+from dml_language_server.config import Config
+from dml_language_server.file_management import FileManager
+import dml_language_server.analysis as analysis_module
+from dml_language_server.analysis import (
+    AdvancedSymbolTable, DeviceAnalysis, DMLErrorKind, IsolatedAnalysis, SymbolScope,
+    compute_content_hash
+)
+from dml_language_server.lsp_data import DMLLocation, DMLSymbol, DMLSymbolKind
+from dml_language_server.span import ZeroSpan, ZeroRange, ZeroPosition
+
+
+SAMPLE_CONTENT = """dml 1.4;
+
+device TestDevice;
+
+bank regs {
+    register ctrl[4] @ 0x00 {
+        field enable @ [0];
+    }
+}
+"""
+
+
+@pytest.fixture
+def analysis_engine():
+    """Create a fresh analysis engine."""
+    config = Config()
+    engine = DeviceAnalysis(config, FileManager(config))
+    yield engine
+    engine.shutdown()
+
+
+def make_span(start_line, end_line):
+    """Create a span covering whole lines of a test file."""
+    return ZeroSpan("test.dml", ZeroRange(ZeroPosition(start_line, 0), ZeroPosition(end_line, 0)))
+
+
+class TestSymbolScope:
+    """Test lookups in nested scopes."""
+
+    @pytest.fixture
+    def scopes(self):
+        """Create a file scope with two nested levels."""
+        root = SymbolScope("file", make_span(0, 100))
+        SymbolScope("before", make_span(1, 5), root)
+        outer = SymbolScope("outer", make_span(10, 50), root)
+        inner = SymbolScope("inner", make_span(20, 30), outer)
+        return root, outer, inner
+
+    def test_find_scope_at_position(self, scopes):
+        """Test that the innermost scope containing a position is found."""
+        root, outer, inner = scopes
+        assert root.find_scope_at_position(ZeroPosition(25, 0)) is inner
+        assert root.find_scope_at_position(ZeroPosition(40, 0)) is outer
+        assert root.find_scope_at_position(ZeroPosition(60, 0)) is root
+        assert root.find_scope_at_position(ZeroPosition(200, 0)) is None
+
+    def test_find_scope_among_many_children(self, scopes):
+        """Test that indexed child lookup matches a linear scan."""
+        root, outer, inner = scopes
+        children = [SymbolScope(f"child{i}", make_span(20 + i, 21 + i), outer)
+                    for i in range(SymbolScope.CHILD_INDEX_THRESHOLD)]
+        assert outer.find_scope_at_position(ZeroPosition(25, 0)) is inner
+        assert outer.find_scope_at_position(ZeroPosition(33, 5)) is children[13]
+        assert outer.find_scope_at_position(ZeroPosition(45, 0)) is outer
+
+        late = SymbolScope("late", make_span(45, 46), outer)
+        assert outer.find_scope_at_position(ZeroPosition(45, 0)) is late
+
+    def test_get_all_symbols_follows_additions(self, scopes):
+        """Test that cached symbol lists see symbols added later."""
+        root, outer, inner = scopes
+
+        def add(scope, name):
+            symbol = DMLSymbol(name, DMLSymbolKind.TEMPLATE, DMLLocation(make_span(0, 1)))
+            return scope.add_symbol(symbol)
+
+        first = add(root, "first")
+        nested = add(inner, "nested")
+        assert root.get_all_symbols() == [first, nested]
+
+        later = add(outer, "later")
+        assert root.get_all_symbols() == [first, later, nested]
+        assert root.get_all_symbols(include_children=False) == [first]
+
+    def test_scope_chain_and_resolution(self, scopes):
+        """Test that names resolve through enclosing scopes."""
+        root, outer, inner = scopes
+        assert inner.get_scope_chain() == ("file", "outer", "inner")
+        # Scopes with the same path share one chain
+        twin = SymbolScope("inner", make_span(31, 32), outer)
+        assert twin.get_scope_chain() is inner.get_scope_chain()
+        assert inner.resolve_symbol("missing") is None
+
+        root.symbols["top"] = outer.symbols["top"] = object()
+        assert inner.resolve_symbol("top") is outer.symbols["top"]
+
+    def test_unpickled_scope_chains_are_reshared(self, scopes):
+        """Test that chains from another process rejoin the shared pool."""
+        root, outer, inner = scopes
+        chain = inner.get_scope_chain()
+        symbol = DMLSymbol("nested", DMLSymbolKind.TEMPLATE, DMLLocation(make_span(0, 1)))
+        inner.add_symbol(symbol)
+
+        restored = pickle.loads(pickle.dumps(root))
+        restored_inner = restored.children[1].children[0]
+        assert restored_inner.get_scope_chain() is not chain
+        restored.reintern_scope_chains()
+        assert restored_inner.get_scope_chain() is chain
+        assert restored_inner.symbols["nested"].scope_chain is chain
+
+    def test_scope_chain_pool_is_bounded(self, monkeypatch):
+        """Test that the chain pool does not grow past its limit."""
+        monkeypatch.setattr(analysis_module, "_scope_chains", {})
+        monkeypatch.setattr(analysis_module, "_SCOPE_CHAIN_POOL_SIZE", 8)
+        for i in range(20):
+            assert analysis_module._intern_scope_chain(("file",), f"block{i}") == ("file", f"block{i}")
+        assert len(analysis_module._scope_chains) <= 8
+
+
+class TestAdvancedSymbolTable:
+    """Test concurrent use of the cross-file symbol table."""
+
+    def test_concurrent_writers(self, tmp_path):
+        """Test that writers on several threads do not lose updates."""
+        table = AdvancedSymbolTable()
+
+        def add_symbols(worker):
+            for i in range(50):
+                span = make_span(i, i + 1)
+                symbol = DMLSymbol(f"sym_{worker}_{i}", DMLSymbolKind.TEMPLATE, DMLLocation(span))
+                table.add_global_symbol(symbol)
+                table.create_file_scope(tmp_path / f"file_{worker}_{i}.dml", span)
+
+        threads = [threading.Thread(target=add_symbols, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(table.global_symbols) == 200
+        assert len(table.file_scopes) == 200
+        assert table.resolve_symbol("sym_3_49").symbol.name == "sym_3_49"
+        assert len(table.get_symbols_in_scope(tmp_path / "file_0_0.dml", ZeroPosition(0, 0))) == 200
+
+
+class TestParseCache:
+    """Test reuse of parsed files across analyses."""
+
+    def test_unchanged_content_reuses_analysis(self, analysis_engine, tmp_path):
+        """Test that re-analyzing identical content skips re-parsing."""
+        test_file = tmp_path / "test.dml"
+        analysis_engine.analyze_file(test_file, SAMPLE_CONTENT)
+        first = analysis_engine.file_analyses[test_file.resolve()]
+
+        analysis_engine.analyze_file(test_file, SAMPLE_CONTENT,
+                                     content_hash=compute_content_hash(SAMPLE_CONTENT))
+        assert analysis_engine.file_analyses[test_file.resolve()] is first
+
+    def test_changed_content_reparses(self, analysis_engine, tmp_path):
+        """Test that edited content produces a new analysis."""
+        test_file = tmp_path / "test.dml"
+        analysis_engine.analyze_file(test_file, SAMPLE_CONTENT)
+        first = analysis_engine.file_analyses[test_file.resolve()]
+
+        analysis_engine.analyze_file(test_file, SAMPLE_CONTENT + "\n")
+        assert analysis_engine.file_analyses[test_file.resolve()] is not first
+
+    def test_returned_errors_are_stable(self, analysis_engine, tmp_path):
+        """Test that repeated analyses do not accumulate errors."""
+        test_file = tmp_path / "test.dml"
+        content = SAMPLE_CONTENT + 'import "missing.dml";\n'
+
+        first_errors = analysis_engine.analyze_file(test_file, content)
+        first_errors.append(None)  # Callers may extend the returned list
+        second_errors = analysis_engine.analyze_file(test_file, content)
+        assert len(second_errors) == len(first_errors) - 1
+
+
+class TestDiagnostics:
+    """Test collection of diagnostics across files."""
+
+    def test_iter_all_diagnostics_matches_dict(self, analysis_engine, tmp_path):
+        """Test that streamed diagnostics cover every analyzed file."""
+        for name in ("a", "b"):
+            analysis_engine.analyze_file(tmp_path / f"{name}.dml", SAMPLE_CONTENT + 'import "missing.dml";\n')
+
+        streamed = list(analysis_engine.iter_all_diagnostics())
+        assert [path for path, _ in streamed] == list(analysis_engine.file_analyses)
+        assert dict(streamed) == analysis_engine.get_all_diagnostics()
+        assert all(diagnostics for _, diagnostics in streamed)
+
+
+class TestSymbolDefinitions:
+    """Test registration of a file's symbols."""
+
+    def test_duplicate_symbols_are_reported(self, analysis_engine, tmp_path):
+        """Test that later duplicates are reported and the first one is kept."""
+        test_file = tmp_path / "test.dml"
+        content = "dml 1.4;\ntemplate dup_t {\n}\ntemplate dup_t {\n}\ntemplate single_t {\n}\n"
+        errors = analysis_engine.analyze_file(test_file, content)
+
+        duplicates = [e for e in errors if e.kind == DMLErrorKind.DUPLICATE_SYMBOL]
+        assert [e.message for e in duplicates] == ["Duplicate symbol 'dup_t'"]
+
+        analysis = analysis_engine.file_analyses[test_file.resolve()]
+        first = next(s for s in analysis.symbols if s.name == "dup_t")
+        assert analysis.symbol_definitions["dup_t"].symbol is first
+        assert "single_t" in analysis.symbol_definitions
+
+
+class TestParserFallback:
+    """Test falling back to the basic parser."""
+
+    def test_enhanced_failure_is_remembered(self, monkeypatch, tmp_path):
+        """Test that content the enhanced parser failed on skips it next time."""
+        attempts = []
+
+        class FailingParser:
+            def __init__(self, content, file_path):
+                attempts.append(file_path)
+                raise RuntimeError("unsupported")
+
+        monkeypatch.setattr(analysis_module, "EnhancedDMLParser", FailingParser)
+        monkeypatch.setattr(IsolatedAnalysis, "_enhanced_failures", OrderedDict())
+        content_hash = compute_content_hash(SAMPLE_CONTENT)
+
+        for _ in range(2):
+            analysis = IsolatedAnalysis(tmp_path / "test.dml", SAMPLE_CONTENT, content_hash)
+            assert "TestDevice" in [symbol.name for symbol in analysis.symbols]
+        assert len(attempts) == 1
+
+    def test_dependency_parse_remembers_failure(self, analysis_engine, monkeypatch, tmp_path):
+        """Test that dependency parses consult and record enhanced-parser failures."""
+        attempts = []
+
+        class FailingParser:
+            def __init__(self, content, file_path):
+                attempts.append(file_path)
+                raise RuntimeError("unsupported")
+
+        monkeypatch.setattr(analysis_module, "EnhancedDMLParser", FailingParser)
+        monkeypatch.setattr(IsolatedAnalysis, "_enhanced_failures", OrderedDict())
+        content_hash = compute_content_hash(SAMPLE_CONTENT)
+
+        for name in ("a", "b"):
+            analysis = analysis_engine._parse_dependency(tmp_path / f"{name}.dml", SAMPLE_CONTENT, content_hash)
+            assert "TestDevice" in [symbol.name for symbol in analysis.symbols]
+        assert len(attempts) == 1
+
+    def test_constant_declaration_parses(self, tmp_path):
+        """Test that constants are handled by the enhanced parser."""
+        analysis = IsolatedAnalysis(tmp_path / "test.dml", "dml 1.4;\nconstant X = 5;\n")
+        assert analysis.enhanced_parser is not None
+        assert [type(decl).__name__ for decl in analysis.ast_declarations] == [
+            "DMLVersionDeclaration", "ConstantDeclaration"
+        ]
+        assert not [e for e in analysis.errors if e.kind == DMLErrorKind.SYNTAX_ERROR]
+
+
+class TestDependencyAnalysis:
+    """Test analysis of imported files."""
+
+    def test_transitive_dependencies_are_analyzed(self, analysis_engine, tmp_path):
+        """Test that dependencies of dependencies are read and parsed."""
+        main_file = tmp_path / "main.dml"
+        main_file.write_text(SAMPLE_CONTENT + 'import "a.dml";\n')
+        (tmp_path / "a.dml").write_text('dml 1.4;\nimport "b.dml";\n')
+        (tmp_path / "b.dml").write_text('dml 1.4;\ntemplate b_template {\n}\n')
+
+        for path in (main_file, tmp_path / "a.dml"):
+            analysis_engine.file_manager.get_file_info(path)
+        analysis_engine.analyze_file(main_file, main_file.read_text())
+
+        analyzed = set(analysis_engine.file_analyses)
+        assert (tmp_path / "a.dml").resolve() in analyzed
+        assert (tmp_path / "b.dml").resolve() in analyzed
+
+    def test_parallel_parsing_matches_serial(self, analysis_engine, tmp_path):
+        """Test that dependencies parsed in worker processes are complete."""
+        main_file = tmp_path / "main.dml"
+        main_file.write_text(SAMPLE_CONTENT + 'import "a.dml";\nimport "b.dml";\n')
+        for name in ("a", "b"):
+            (tmp_path / f"{name}.dml").write_text(f'dml 1.4;\ntemplate {name}_template {{\n}}\n')
+
+        analysis_engine.PARALLEL_PARSE_THRESHOLD = 1
+        analysis_engine.file_manager.get_file_info(main_file)
+        analysis_engine.analyze_file(main_file, main_file.read_text())
+
+        for name in ("a", "b"):
+            analysis = analysis_engine.file_analyses[(tmp_path / f"{name}.dml").resolve()]
+            assert [symbol.name for symbol in analysis.symbols] == ["dml", f"{name}_template"]
+
+        workers = list(analysis_engine._process_pool._processes.values())
+        analysis_engine.shutdown()
+        assert analysis_engine._process_pool is None
+        assert not any(worker.is_alive() for worker in workers)
+
+    def test_worker_result_leaves_out_parser(self, tmp_path):
+        """Test that dependency parses do not carry the parser back to the caller."""
+        analysis = analysis_module._parse_isolated(
+            (tmp_path / "a.dml", SAMPLE_CONTENT, compute_content_hash(SAMPLE_CONTENT)))
+        assert analysis.enhanced_parser is None
+        assert "TestDevice" in [symbol.name for symbol in analysis.symbols]
+
+    def test_free_threaded_parsing_uses_threads(self, analysis_engine, tmp_path, monkeypatch):
+        """Test that dependencies are parsed on threads when there is no GIL."""
+        monkeypatch.setattr(analysis_module, "_gil_enabled", lambda: False)
+        main_file = tmp_path / "main.dml"
+        main_file.write_text(SAMPLE_CONTENT + 'import "a.dml";\n')
+        (tmp_path / "a.dml").write_text('dml 1.4;\ntemplate a_template {\n}\n')
+
+        analysis_engine.PARALLEL_PARSE_THRESHOLD = 1
+        analysis_engine.file_manager.get_file_info(main_file)
+        analysis_engine.analyze_file(main_file, main_file.read_text())
+
+        analysis = analysis_engine.file_analyses[(tmp_path / "a.dml").resolve()]
+        assert [symbol.name for symbol in analysis.symbols] == ["dml", "a_template"]
+        assert analysis_engine._process_pool is None
+
+    def test_import_resolves_after_file_is_created(self, analysis_engine, tmp_path):
+        """Test that invalidation refreshes cached directory listings."""
+        main_file = tmp_path / "main.dml"
+        content = SAMPLE_CONTENT + 'import "later.dml";\n'
+
+        def import_errors():
+            errors = analysis_engine.analyze_file(main_file, content)
+            return [e for e in errors if e.kind == DMLErrorKind.IMPORT_ERROR]
+
+        assert len(import_errors()) == 1
+
+        later_file = tmp_path / "later.dml"
+        later_file.write_text("dml 1.4;\n")
+        analysis_engine.invalidate_file(later_file)
+        assert import_errors() == []
+
+    def test_unchanged_file_is_not_invalidated(self, analysis_engine, tmp_path):
+        """Test that invalidating a file with its analyzed content is a no-op."""
+        main_file = tmp_path / "main.dml"
+        main_file.write_text(SAMPLE_CONTENT + 'import "a.dml";\n')
+        dep_file = tmp_path / "a.dml"
+        dep_file.write_text("dml 1.4;\n")
+        analysis_engine.file_manager.get_file_info(main_file)
+        analysis_engine.analyze_file(main_file, main_file.read_text())
+
+        assert analysis_engine.invalidate_file(dep_file) == set()
+        assert analysis_engine.invalidate_file(dep_file, "dml 1.4;\n") == set()
+        assert dep_file.resolve() in analysis_engine.file_analyses
+
+        dep_file.write_text("dml 1.4;\ntemplate t {\n}\n")
+        affected = analysis_engine.invalidate_file(dep_file)
+        assert affected == {dep_file.resolve(), main_file.resolve()}
+        assert dep_file.resolve() not in analysis_engine.file_analyses
+
+    def test_import_resolves_after_include_path_is_added(self, analysis_engine, tmp_path):
+        """Test that cached include paths follow configuration changes."""
+        main_file = tmp_path / "main.dml"
+        include_dir = tmp_path / "include"
+        include_dir.mkdir()
+        (include_dir / "lib.dml").write_text("dml 1.4;\n")
+        content = SAMPLE_CONTENT + 'import "lib.dml";\n'
+
+        def import_errors():
+            errors = analysis_engine.analyze_file(main_file, content)
+            return [e for e in errors if e.kind == DMLErrorKind.IMPORT_ERROR]
+
+        assert len(import_errors()) == 1
+
+        analysis_engine.config.add_include_path(include_dir)
+        assert import_errors() == []
+
+    def test_directory_does_not_satisfy_import(self, analysis_engine, tmp_path):
+        """Test that only regular files resolve imports."""
+        main_file = tmp_path / "main.dml"
+        (tmp_path / "subdir.dml").mkdir()
+        errors = analysis_engine.analyze_file(main_file, SAMPLE_CONTENT + 'import "subdir.dml";\n')
+        assert [e.kind for e in errors].count(DMLErrorKind.IMPORT_ERROR) == 1
+
+
+class TestGlobalSymbolTable:
+    """Test maintenance of the cross-file symbol table."""
+
+    def test_reanalysis_replaces_file_symbols(self, analysis_engine, tmp_path):
+        """Test that only the edited file's definitions are replaced."""
+        first_file = tmp_path / "first.dml"
+        second_file = tmp_path / "second.dml"
+        analysis_engine.analyze_file(first_file, "dml 1.4;\ntemplate common_t {\n}\n")
+        analysis_engine.analyze_file(second_file, "dml 1.4;\ntemplate common_t {\n}\ntemplate removed_t {\n}\n")
+        assert len(analysis_engine.find_symbol_definitions("common_t")) == 2
+        assert len(analysis_engine.find_symbol_definitions("removed_t")) == 1
+
+        analysis_engine.analyze_file(second_file, "dml 1.4;\ntemplate common_t {\n}\ntemplate added_t {\n}\n")
+        assert len(analysis_engine.find_symbol_definitions("common_t")) == 2
+        assert analysis_engine.find_symbol_definitions("removed_t") == []
+        assert len(analysis_engine.find_symbol_definitions("added_t")) == 1
+
+    def test_invalidated_file_symbols_are_removed(self, analysis_engine, tmp_path):
+        """Test that invalidated files stop contributing definitions."""
+        first_file = tmp_path / "first.dml"
+        second_file = tmp_path / "second.dml"
+        analysis_engine.analyze_file(first_file, "dml 1.4;\ntemplate gone_t {\n}\n")
+        analysis_engine.invalidate_file(first_file)
+        assert analysis_engine.find_symbol_definitions("gone_t") == []
+        analysis_engine.analyze_file(second_file, "dml 1.4;\n")
+
+        assert analysis_engine.find_symbol_definitions("gone_t") == []
+        assert first_file.resolve() not in analysis_engine.symbol_table.file_scopes
+
+
+class TestDebouncedAnalysis:
+    """Test coalescing of scheduled analyses."""
+
+    def test_burst_coalesces_to_latest_content(self, analysis_engine, tmp_path):
+        """Test that rapid scheduling runs one analysis of the last content."""
+        test_file = tmp_path / "test.dml"
+        futures = [
+            analysis_engine.schedule_analysis(test_file, SAMPLE_CONTENT + "\n" * i)
+            for i in range(5)
+        ]
+        assert all(future is futures[0] for future in futures)
+
+        futures[0].result(timeout=5)
+        analysis = analysis_engine.file_analyses[test_file.resolve()]
+        assert analysis.content == SAMPLE_CONTENT + "\n" * 4
+
+    def test_analyze_file_now_flushes_pending(self, analysis_engine, tmp_path):
+        """Test that a pending analysis can be run without waiting."""
+        test_file = tmp_path / "test.dml"
+        analysis_engine.ANALYSIS_DEBOUNCE_SECONDS = 60
+        future = analysis_engine.schedule_analysis(test_file, SAMPLE_CONTENT)
+
+        errors = analysis_engine.analyze_file_now(test_file)
+        assert future.done()
+        assert future.result() == errors
+        assert analysis_engine.analyze_file_now(test_file) is None
+
+    def test_invalidation_waits_for_running_analysis(self, analysis_engine, tmp_path):
+        """Test that invalidation does not interleave with an analysis thread."""
+        test_file = tmp_path / "test.dml"
+        analysis_engine.analyze_file(test_file, SAMPLE_CONTENT)
+        done = threading.Event()
+
+        def invalidate():
+            analysis_engine.invalidate_file(test_file, "dml 1.4;\n")
+            done.set()
+
+        with analysis_engine._analysis_lock:
+            thread = threading.Thread(target=invalidate)
+            thread.start()
+            assert not done.wait(0.1)
+            assert test_file.resolve() in analysis_engine.file_analyses
+        thread.join(timeout=5)
+        assert done.is_set()
+        assert test_file.resolve() not in analysis_engine.file_analyses
+
+    def test_scheduling_does_not_wait_for_running_analysis(self, analysis_engine, tmp_path):
+        """Test that scheduling returns while another analysis holds the engine."""
+        test_file = tmp_path / "test.dml"
+        scheduled = threading.Event()
+
+        def schedule():
+            analysis_engine.schedule_analysis(test_file, SAMPLE_CONTENT)
+            scheduled.set()
+
+        with analysis_engine._analysis_lock:
+            thread = threading.Thread(target=schedule)
+            thread.start()
+            assert scheduled.wait(5)
+            future = analysis_engine._pending[test_file.resolve()][1]
+            assert not future.done()
+        thread.join(timeout=5)
+        assert future.result(timeout=5) == analysis_engine.analyze_file(test_file, SAMPLE_CONTENT)
+
+    def test_failed_scheduled_analysis_resolves_future(self, analysis_engine, tmp_path, monkeypatch):
+        """Test that a failing analysis is reported through its future only."""
+        test_file = tmp_path / "test.dml"
+
+        def fail(*args):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(analysis_engine, "analyze_file", fail)
+        analysis_engine.ANALYSIS_DEBOUNCE_SECONDS = 60
+        future = analysis_engine.schedule_analysis(test_file, SAMPLE_CONTENT)
+
+        assert analysis_engine.analyze_file_now(test_file) is None
+        with pytest.raises(RuntimeError, match="boom"):
+            future.result(timeout=5)
@@ -5,6 +5,7 @@ Basic tests for the DML Language Server Python port.
 SPDX-License-Identifier: Apache-2.0 and MIT
 """
 
+import pickle
 import pytest
 from pathlib import Path
 import tempfile
@@ -12,8 +13,10 @@ import tempfile
 from dml_language_server import version, internal_error
 from dml_language_server.config import Config
 from dml_language_server.vfs import VFS
-from dml_language_server.span import Position, Range, Span, ZeroIndexed, OneIndexed
-from dml_language_server.analysis.parsing import DMLLexer, DMLParser, TokenType
+from dml_language_server.file_management import FileManager
+from dml_language_server.span import Position, Range, Span, SpanBuilder, SpanIndex, ZeroIndexed, ZeroPosition, OneIndexed
+from dml_language_server.analysis.parsing import DMLLexer, DMLParser, TokenType, TK
+from dml_language_server.analysis.parsing.enhanced_parser import DMLLexer as EnhancedDMLLexer
 
 
 class TestBasicFunctionality:
@@ -66,6 +69,54 @@ class TestBasicFunctionality:
         assert span.file_path == "test.dml"
         assert span.start == start_pos
         assert span.end == end_pos
+    
+    def test_span_pickle_round_trip(self):
+        """Test that slotted, frozen spans survive pickling."""
+        span = Span[ZeroIndexed]("test.dml", Range[ZeroIndexed](
+            Position[ZeroIndexed](1, 2), Position[ZeroIndexed](3, 4)
+        ))
+        restored = pickle.loads(pickle.dumps(span))
+        
+        assert restored == span
+        assert hash(restored) == hash(span)
+        assert not hasattr(restored.start, "__dict__")
+    
+    def test_span_builder_offsets(self):
+        """Test conversion between offsets and positions."""
+        builder = SpanBuilder("test.dml")
+        builder.set_content("dml 1.4;\n\ndevice Test;")
+        
+        assert builder.position_from_offset(0) == Position[ZeroIndexed](0, 0)
+        assert builder.position_from_offset(9) == Position[ZeroIndexed](1, 0)
+        assert builder.position_from_offset(17) == Position[ZeroIndexed](2, 7)
+        assert builder.position_from_offset(100) == Position[ZeroIndexed](2, 12)
+        assert builder.offset_from_position(Position[ZeroIndexed](2, 7)) == 17
+        assert builder.offset_from_position(Position[ZeroIndexed](0, 50)) == 9
+    
+    def test_span_index_lookup(self):
+        """Test span index point queries match a linear scan."""
+        def make_span(start_line, start_col, end_line, end_col):
+            return Span[ZeroIndexed]("test.dml", Range[ZeroIndexed](
+                Position[ZeroIndexed](start_line, start_col),
+                Position[ZeroIndexed](end_line, end_col)
+            ))
+        
+        entries = [
+            (make_span(0, 0, 10, 1), "device"),
+            (make_span(2, 4, 5, 5), "bank"),
+            (make_span(3, 8, 3, 20), "register"),
+            (make_span(7, 0, 7, 0), "empty"),
+        ]
+        index = SpanIndex(entries)
+        
+        for line in range(12):
+            for column in range(25):
+                position = Position[ZeroIndexed](line, column)
+                expected = next(
+                    (value for span, value in entries if span.contains_position(position)),
+                    None
+                )
+                assert index.find(position) == expected
 
 
 class TestDMLLexer:
@@ -120,6 +171,108 @@ class TestDMLLexer:
         # Comments should be filtered out in tokenize()
         comment_tokens = [t for t in tokens if t.type == TokenType.COMMENT]
         assert len(comment_tokens) == 0
+    
+    def test_regex_scan_matches_character_reader(self):
+        """Test that tokenize() agrees with the character-by-character reader."""
+        samples = [
+            "dml 1.4;\ndevice Test {\n  /* multi\n line */ bank b @ 0x10;\n}",
+            'param s = "a\\"b\\n"; // trailing',
+            '"bad \\q escape" "unterminated\n"still',
+            "1.2.3 1e+x 0x 0xfg 12abc 1e5. 3.",
+            "/* never closed",
+            "café _x été # ~",
+        ]
+        for content in samples:
+            reference = DMLLexer(content, "test.dml")
+            expected = []
+            while reference.position < len(content):
+                token = reference._next_token()
+                if token.type not in (TokenType.WHITESPACE, TokenType.COMMENT):
+                    expected.append((token.type, token.value, token.span))
+
+            lexer = DMLLexer(content, "test.dml")
+            tokens = lexer.tokenize()
+            assert [(t.type, t.value, t.span) for t in tokens[:-1]] == expected
+            assert tokens[-1].span.start == ZeroPosition(reference.line, reference.column)
+            assert ([(e.message, e.span) for e in lexer.get_errors()] ==
+                    [(e.message, e.span) for e in reference.get_errors()])
+    
+    def test_scan_arrays(self):
+        """Test that scan() describes the same tokens as tokenize()."""
+        content = 'device D {\n  param p = "multi\\\nline";\n  bank b @ 0x10;\n}'
+        tokens = DMLLexer(content, "test.dml").tokenize()
+        scanned = DMLLexer(content, "test.dml").scan()
+
+        assert [scanned.token(i).type for i in range(len(tokens))] == [t.type for t in tokens]
+        assert scanned.values == [t.value for t in tokens]
+        assert [scanned.token(i).span for i in range(len(tokens))] == [t.span for t in tokens]
+        assert scanned.kinds[-1] == TK.EOF
+    
+    def test_repeated_names_share_one_string(self):
+        """Test that repeated identifiers and keywords reuse one str object."""
+        content = "register r1; register r1;"
+        values = DMLLexer(content, "test.dml").scan().values
+        
+        assert values[0] is values[3]
+        assert values[1] is values[4]
+
+
+class TestEnhancedDMLLexer:
+    """Test the enhanced parser's lexer."""
+    
+    def test_regex_scan_matches_character_reader(self):
+        """Test that tokenize() agrees with the character-by-character reader."""
+        samples = [
+            "dml 1.4;\ndevice Test {\n  /* multi\n line */ bank b @ 0x10UL;\n}",
+            "#if (x <<= 2 ... y->z) #else { a::b } #foreach #select #? #: #",
+            "header %{\n#include <x.h>\n%} %{ never closed",
+            "s = \"a\\\"b\\n\" + 'c' + '\\'' + \"esc\\\nnewline\" \"open",
+            "1.2.3 1e+x .5f 0x 0xfgu 12abc ... /* never closed",
+            "café _x été 1٣ ~ ` \\",
+        ]
+        for content in samples:
+            reference = EnhancedDMLLexer(content, "test.dml")
+            expected = []
+            while reference.position < len(content):
+                reference._skip_whitespace_and_comments()
+                if reference.position < len(content):
+                    token = reference._next_token()
+                    expected.append((token.type, token.value, token.span))
+            
+            tokens = EnhancedDMLLexer(content, "test.dml").tokenize()
+            assert [(t.type, t.value, t.span) for t in tokens[:-1]] == expected
+            assert tokens[-1].span.start == ZeroPosition(reference.line, reference.column)
+    
+    def test_multiline_literal_spans(self):
+        """Test that literals spanning lines end on the right line."""
+        content = "a = \"x\\\ny\";\nb = 'p\nq';"
+        tokens = EnhancedDMLLexer(content, "test.dml").tokenize()
+        
+        assert tokens[2].value == "x\ny"
+        assert tokens[2].span.end == ZeroPosition(1, 2)
+        assert tokens[3].span.start == ZeroPosition(1, 2)
+        assert tokens[6].value == "p\nq"
+        assert tokens[6].span.end == ZeroPosition(3, 2)
+    
+    def test_repeated_spellings_share_one_string(self):
+        """Test that repeated names, keywords and operators reuse one str object."""
+        content = "register r1 <<= x; register r1 <<= x;"
+        values = [t.value for t in EnhancedDMLLexer(content, "test.dml").tokenize()]
+        
+        assert values[0] is values[5]
+        assert values[1] is values[6]
+        assert values[2] is values[7]
+    
+    def test_scan_stream(self):
+        """Test that scan() describes the same tokens as tokenize()."""
+        content = "bank b {\n  register r @ 0x10 is (read, write);\n}"
+        tokens = EnhancedDMLLexer(content, "test.dml").tokenize()
+        stream = EnhancedDMLLexer(content, "test.dml").scan()
+        
+        assert [stream.type_at(i) for i in range(len(tokens))] == [t.type for t in tokens]
+        assert stream.values == [t.value for t in tokens]
+        assert [stream.span_at(i) for i in range(len(tokens))] == [t.span for t in tokens]
+        assert [stream.token(i) for i in range(len(tokens))] == tokens
 
 
 class TestDMLParser:
@@ -213,6 +366,19 @@ class TestFileOperations:
             
             # VFS should be able to detect and read it
             assert vfs.file_exists(test_path)
+    
+    def test_cached_file_reads(self):
+        """Test that file content is reused until the file changes."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_manager = FileManager(Config())
+            test_path = Path(temp_dir) / "test.dml"
+            test_path.write_text("dml 1.4;\n")
+            
+            first = file_manager.read_cached(test_path)
+            assert file_manager.read_cached(test_path) is first
+            
+            test_path.write_text("dml 1.4;\ndevice Test;\n")
+            assert file_manager.read_cached(test_path) == "dml 1.4;\ndevice Test;\n"
 
 
 @pytest.mark.asyncio